@@ -0,0 +1,281 @@
+"""End-to-end benchmark of the analyze_video pipeline, stage by stage.
+
+Generates synthetic comment corpora modeled on outputs/analysis.csv (its
+words, emoji, likes and posting times) and runs each pipeline stage on
+them in process: text features, temporal features, scoring, compaction,
+save_core_data and every derived export, each chart stage, chart data,
+create_reports, the executive summary and build_zip. Wall time, CPU time,
+peak RSS and throughput per stage are written as JSON, so reports from
+different commits can be compared with --compare.
+
+    python benchmarks/bench_pipeline.py --sizes 1000,10000 --output before.json
+    python benchmarks/bench_pipeline.py --sizes 1000,10000 --compare before.json
+
+Scoring runs in this process and without the sentiment cache unless
+SENTIMENT_WORKERS / SENTIMENT_CACHE_SIZE say otherwise, so CPU times cover
+all the work and repeated runs score the same texts from scratch.
+"""
+import os, sys, json, time, shutil, argparse, platform, tempfile, threading, warnings, subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+for key, value in {"SENTIMENT_WORKERS": "0", "RENDER_WORKERS": "0", "SENTIMENT_CACHE_SIZE": "0",
+                   "SENTIMENT_CACHE_PATH": "", "API_CACHE_PATH": ""}.items():
+    os.environ.setdefault(key, value)
+warnings.filterwarnings("ignore", message="Glyph .* missing from current font")
+
+import numpy as np
+import pandas as pd
+import app
+from config import SENTIMENT_SCORER
+from services.charts import CHART_STAGES
+from services.frame_schema import compact_frame
+from services.metrics import rss_bytes
+from services.render_service import render_stage
+from services.sentiment_service import score_texts, SCORERS
+
+SAMPLE_CSV = os.path.join(ROOT, "outputs", "analysis.csv")
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+# Share of comments copied verbatim from the sample: real videos repeat short comments a lot
+VERBATIM_SHARE = 0.2
+
+
+class SyntheticCorpus:
+    """Raw comments shaped like the sample: its tokens (emoji included),
+    comment lengths, likes and posting hours and weekdays."""
+
+    def __init__(self, path: str = SAMPLE_CSV):
+        sample = pd.read_csv(path)
+        self.texts = sample["text"].fillna("").astype(str).to_numpy(dtype=object)
+        tokens = pd.Series([t for text in self.texts for t in text.split()]).value_counts()
+        self.vocab = tokens.index.to_numpy(dtype=object)
+        self.token_p = (tokens / tokens.sum()).to_numpy()
+        self.token_counts = np.array([max(1, len(t.split())) for t in self.texts])
+        self.likes = pd.to_numeric(sample["likes"], errors="coerce").fillna(0).astype(int).to_numpy()
+        self.authors = sample["author"].fillna("").astype(str).to_numpy(dtype=object)
+        published = pd.to_datetime(sample["published_at"], errors="coerce").dropna()
+        self.published = published.to_numpy(dtype="datetime64[s]")
+
+    def comments(self, n: int, seed: int = 0) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        lengths = rng.choice(self.token_counts, size=n)
+        words = self.vocab[rng.choice(len(self.vocab), size=int(lengths.sum()), p=self.token_p)]
+        ends = np.cumsum(lengths)
+        text = [" ".join(words[end - size:end]) for end, size in zip(ends.tolist(), lengths.tolist())]
+        verbatim = np.flatnonzero(rng.random(n) < VERBATIM_SHARE)
+        text = np.array(text, dtype=object)
+        text[verbatim] = rng.choice(self.texts, size=len(verbatim))
+
+        # Sample posting times moved by whole weeks keep their hour and weekday
+        weeks = rng.integers(0, 52, size=n).astype("timedelta64[W]").astype("timedelta64[s]")
+        seconds = rng.integers(-1800, 1800, size=n).astype("timedelta64[s]")
+        published = rng.choice(self.published, size=n) - weeks + seconds
+        stamps = pd.Series(published).dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return pd.DataFrame({
+            "author": [f"{a} {k}" for a, k in zip(rng.choice(self.authors, size=n), rng.zipf(1.5, size=n) % 1000)],
+            "text": text,
+            "likes": rng.choice(self.likes, size=n),
+            "published_at": stamps,
+            "comment_id": [f"bench-{seed}-{i}" for i in range(n)],
+            "updated_at": stamps,
+        })
+
+
+class StageMeter:
+    """Wall time, CPU time and peak RSS of one stage.
+
+    RSS is sampled on a thread every `interval` seconds while the stage runs,
+    since the process-wide ru_maxrss cannot be reset between stages."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+
+    def __enter__(self):
+        self._stop = threading.Event()
+        self.peak = rss_bytes()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        self._cpu, self._wall = time.process_time(), time.perf_counter()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self._wall
+        self.cpu = time.process_time() - self._cpu
+        self._stop.set()
+        self._sampler.join()
+        self.peak = max(self.peak, rss_bytes())
+        return False
+
+
+def run_pipeline(raw: pd.DataFrame, out_dir: str, scorer: str) -> dict:
+    """Every stage of run_analysis after the fetch, timed one by one"""
+    n = len(raw)
+    stages = {}
+    state = {"df": raw}
+
+    def stage(name, fn):
+        error = None
+        # Stage progress prints go to stderr, keeping stdout for the JSON report
+        with StageMeter() as meter, redirect_stdout(sys.stderr):
+            try:
+                fn()
+            except Exception as e:
+                error = str(e)
+        stages[name] = {
+            "wall_seconds": round(meter.wall, 4),
+            "cpu_seconds": round(meter.cpu, 4),
+            "peak_rss_mb": round(meter.peak / 2**20, 1),
+            "comments_per_second": round(n / max(meter.wall, 1e-9), 1),
+            "error": error,
+        }
+        print(f"  {name:<28} {meter.wall:8.3f}s wall {meter.cpu:8.3f}s cpu {meter.peak / 2**20:8.1f} MiB"
+              + (f"  ERROR {error}" if error else ""), file=sys.stderr)
+
+    def text_features():
+        state["df"] = app.add_text_features(state["df"])
+
+    def temporal_features():
+        state["df"] = app.add_temporal_features(state["df"])
+
+    def score():
+        df = state["df"]
+        state["df"] = app.apply_scores(df, score_texts(df["cleaned"].tolist(), scorer=scorer))
+
+    def compact():
+        df = compact_frame(state["df"])
+        df.attrs["scorer"] = SCORERS[scorer]
+        summary = app.RunningSummary()
+        summary.update(df)
+        state.update(df=df, meta={"video_id": "benchmark", "title": "Benchmark", "channel": "Benchmark",
+                                  **summary.to_dict()})
+
+    info = {"title": "Benchmark", "channel": "Benchmark", "published_at": "", "view_count": str(n * 40),
+            "like_count": "0", "comment_count": str(n)}
+    outputs, figures = [], {}
+
+    def core_data():
+        outputs.extend(app.save_core_data(state["df"], info, out_dir, {}))
+
+    def export(fn):
+        return lambda: app.save_exports(out_dir, [fn])
+
+    def chart_stage(name, message, fn):
+        def run():
+            result = render_stage(name, fn, state["df"], out_dir)
+            if result["error"]:
+                raise RuntimeError(result["error"])
+            outputs.extend(result["outputs"])
+            figures.update(result["figures"])
+        return run
+
+    stage("text_features", text_features)
+    stage("temporal_features", temporal_features)
+    stage("score", score)
+    stage("compact", compact)
+    stage("save_core_data", core_data)
+    for fn in app.EXPORTS:
+        stage(f"export:{fn}", export(fn))
+    for name, message, fn in CHART_STAGES:
+        stage(name, chart_stage(name, message, fn))
+    stage("save_chart_data", lambda: outputs.extend(app.save_chart_data(state["df"], out_dir)))
+    stage("create_reports", lambda: outputs.extend(
+        app.create_reports(state["df"], info, state["meta"], outputs, out_dir, figures)))
+    stage("save_executive_summary", lambda: app.save_executive_summary(state["df"], info, state["meta"], out_dir))
+    stage("build_zip", lambda: app.build_zip(out_dir))
+
+    wall = sum(s["wall_seconds"] for s in stages.values())
+    return {
+        "comments": n,
+        "stages": stages,
+        "total": {
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(sum(s["cpu_seconds"] for s in stages.values()), 4),
+            "peak_rss_mb": max(s["peak_rss_mb"] for s in stages.values()),
+            "comments_per_second": round(n / max(wall, 1e-9), 1),
+        },
+    }
+
+
+def environment(scorer: str) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scorer": scorer,
+        "settings": {key: os.environ[key] for key in ("SENTIMENT_WORKERS", "RENDER_WORKERS", "SENTIMENT_CACHE_SIZE")},
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> int:
+    """Print wall-time ratios against a baseline report; returns the number of regressions"""
+    previous = {run["comments"]: run for run in baseline["runs"]}
+    regressions = 0
+    print(f"compared with {baseline['environment'].get('commit')} (slower than x{threshold} is flagged)", file=sys.stderr)
+    for run in report["runs"]:
+        old = previous.get(run["comments"])
+        if old is None:
+            continue
+        print(f"{run['comments']} comments", file=sys.stderr)
+        for name, now in [*run["stages"].items(), ("total", run["total"])]:
+            before = old["stages"].get(name) if name != "total" else old["total"]
+            if not before:
+                continue
+            ratio = now["wall_seconds"] / max(before["wall_seconds"], 1e-9)
+            # Stages this short are mostly timer noise
+            slower = ratio > threshold and now["wall_seconds"] > 0.05
+            regressions += slower
+            print(f"  {name:<28} {before['wall_seconds']:8.3f}s -> {now['wall_seconds']:8.3f}s  "
+                  f"x{ratio:.2f}{'  REGRESSION' if slower else ''}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated corpus sizes (default {DEFAULT_SIZES})")
+    parser.add_argument("--scorer", default=SENTIMENT_SCORER, choices=sorted(SCORERS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="JSON report of an earlier run to compare wall times with")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    parser.add_argument("--keep", action="store_true", help="keep each run's output directory")
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus()
+    report = {"environment": environment(args.scorer), "runs": []}
+    for n in (int(size) for size in args.sizes.split(",")):
+        raw = corpus.comments(n, args.seed)
+        out_dir = tempfile.mkdtemp(prefix=f"bench-{n}-")
+        print(f"{n} comments -> {out_dir}", file=sys.stderr)
+        try:
+            report["runs"].append(run_pipeline(raw, out_dir, args.scorer))
+        finally:
+            if not args.keep:
+                shutil.rmtree(out_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare, encoding="utf8") as f:
+            if compare(report, json.load(f), args.threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
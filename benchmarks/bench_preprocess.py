@@ -0,0 +1,79 @@
+"""Micro-benchmark of comment preprocessing over outputs/analysis.csv.
+
+Compares the per-row clean_text/extract_emojis/len applies the pipeline used
+to run with the batched versions in services.text_preprocess, and checks
+that the cleaned column comes out identical.
+
+    python benchmarks/bench_preprocess.py [copies of the sample corpus, default 20]
+"""
+import os, re, sys, time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import emoji
+import pandas as pd
+from services.text_preprocess import clean_texts, extract_emoji_lists
+
+SAMPLE_CSV = os.path.join(ROOT, "outputs", "analysis.csv")
+
+
+def clean_text_per_row(t: str) -> str:
+    t = re.sub(r"http\S+", "", t)
+    t = re.sub(r"[@#]\S+", "", t)
+    t = re.sub(r"[^A-Za-z0-9\s]", "", t)
+    return re.sub(r"\s+", " ", t).strip()
+
+
+def extract_emojis_per_char(text: str) -> list:
+    return [c for c in text if c in emoji.EMOJI_DATA]
+
+
+def timed(fn, *args, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    text = pd.concat([pd.read_csv(SAMPLE_CSV)["text"]] * copies, ignore_index=True).astype(str)
+    print(f"{len(text)} comments ({copies} copies of {SAMPLE_CSV})")
+
+    rows = [
+        ("cleaned", lambda: text.apply(clean_text_per_row), lambda: clean_texts(text)),
+        ("length", lambda: text.apply(len), lambda: text.str.len()),
+        ("emojis", lambda: text.apply(extract_emojis_per_char), lambda: extract_emoji_lists(text)),
+    ]
+    total_old = total_new = 0.0
+    results = {}
+    for name, old, new in rows:
+        old_seconds, old_result = timed(old)
+        new_seconds, new_result = timed(new)
+        total_old, total_new = total_old + old_seconds, total_new + new_seconds
+        results[name] = (old_result, new_result)
+        print(f"{name:<8} per-row {old_seconds:.3f}s  batched {new_seconds:.3f}s  "
+              f"({old_seconds / max(new_seconds, 1e-9):.1f}x)")
+    print(f"{'total':<8} per-row {total_old:.3f}s  batched {total_new:.3f}s  "
+          f"({total_old / max(total_new, 1e-9):.1f}x)")
+
+    old_cleaned, new_cleaned = results["cleaned"]
+    mismatches = int((old_cleaned != new_cleaned).sum())
+    print(f"cleaned: {mismatches} of {len(text)} rows differ")
+
+    # The emoji column changes on purpose: sequences are no longer split into code points
+    old_emojis, new_emojis = (Counter(e for lst in column for e in lst) for column in results["emojis"])
+    multi = {e: n for e, n in new_emojis.items() if len(e) > 1}
+    print(f"emojis: {sum(old_emojis.values())} code points before, {sum(new_emojis.values())} emoji now, "
+          f"{sum(multi.values())} of them multi-codepoint sequences ({', '.join(list(multi)[:10])})")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Stand-in for the parts of the YouTube Data API the fetcher uses.
+
+Serves /videos and paginated /commentThreads for any video id from a
+synthetic corpus: comment texts are cycled from outputs/analysis.csv and
+every other field is derived from the comment's position, so the same
+options always produce the same pages. Latency and error rates are
+configurable, so load and benchmark runs need neither network nor quota.
+
+    python benchmarks/fake_youtube_api.py --comments 100000 --latency 0.05 --error-rate 0.01
+
+then point the backend at it (any API key is accepted):
+
+    YOUTUBE_API_BASE=http://127.0.0.1:8765/youtube/v3 YOUTUBE_API_KEY=fake python app.py
+"""
+import os, csv, sys, time, random, hashlib, logging, argparse, threading
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask, request, jsonify
+from werkzeug.serving import make_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CSV = os.path.join(ROOT, "outputs", "analysis.csv")
+NEWEST_COMMENT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+MAX_RESULTS = 100
+# Statuses an injected failure answers with, as the real API does under load or quota
+ERROR_STATUSES = (500, 503, 429)
+
+
+def load_corpus(path: str = SAMPLE_CSV) -> list[str]:
+    with open(path, newline="", encoding="utf8") as f:
+        texts = [row["text"] for row in csv.DictReader(f) if row.get("text")]
+    return texts or ["Great video!"]
+
+
+def _timestamp(index: int) -> str:
+    # Comment 0 is the newest; each older one was posted 37 seconds earlier
+    return (NEWEST_COMMENT - timedelta(seconds=37 * index)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def create_app(comments: int = 10000, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+               seed: int = 0, corpus: list[str] | None = None) -> Flask:
+    """Fake API app serving `comments` comments per video.
+
+    Every request sleeps latency seconds (plus up to jitter more) and fails
+    with probability error_rate."""
+    corpus = corpus or load_corpus()
+    rng, lock = random.Random(seed), threading.Lock()
+    app = Flask(__name__)
+    app.config["stats"] = stats = {"requests": 0, "errors": 0, "not_modified": 0}
+
+    def comment(video_id: str, index: int) -> dict:
+        published = _timestamp(index)
+        top = {
+            "id": f"{video_id}-c{index:08d}",
+            "snippet": {
+                "authorDisplayName": f"Viewer {(index * 7919 + seed) % 5000}",
+                "textDisplay": corpus[index % len(corpus)],
+                "likeCount": (index * 2654435761 + seed) % 1000 // (1 + index % 7),
+                "publishedAt": published,
+                "updatedAt": published
+            }
+        }
+        return {"id": top["id"], "snippet": {"videoId": video_id, "topLevelComment": top}}
+
+    def respond(payload: dict):
+        etag = hashlib.sha1(repr(sorted(request.args.items(multi=True))).encode()).hexdigest()
+        if request.headers.get("If-None-Match") == etag:
+            with lock:
+                stats["not_modified"] += 1
+            return "", 304, {"ETag": etag}
+        response = jsonify(payload)
+        response.headers["ETag"] = etag
+        return response
+
+    @app.before_request
+    def delay_or_fail():
+        with lock:
+            stats["requests"] += 1
+            delay = latency + (rng.random() * jitter if jitter else 0.0)
+            failed = rng.random() < error_rate
+            status = rng.choice(ERROR_STATUSES)
+        if delay:
+            time.sleep(delay)
+        if failed:
+            with lock:
+                stats["errors"] += 1
+            return jsonify({"error": {"code": status, "message": "Injected failure"}}), status
+        if not request.args.get("key"):
+            return jsonify({"error": {"code": 403, "message": "The request is missing a valid API key."}}), 403
+
+    @app.route("/youtube/v3/videos")
+    def videos():
+        video_id = request.args.get("id", "")
+        return respond({"items": [{
+            "id": video_id,
+            "snippet": {"title": f"Benchmark video {video_id}", "channelTitle": "Fake YouTube API",
+                        "publishedAt": _timestamp(comments)},
+            "statistics": {"viewCount": str(comments * 40), "likeCount": str(comments * 2),
+                           "commentCount": str(comments)}
+        }]})
+
+    @app.route("/youtube/v3/commentThreads")
+    def comment_threads():
+        video_id = request.args.get("videoId", "")
+        page_size = min(MAX_RESULTS, max(1, int(request.args.get("maxResults", 20))))
+        token = request.args.get("pageToken", "")
+        try:
+            start = int(token[1:]) if token else 0
+        except ValueError:
+            return jsonify({"error": {"code": 400, "message": "Invalid pageToken"}}), 400
+        end = min(comments, start + page_size)
+        payload = {"pageInfo": {"totalResults": comments, "resultsPerPage": page_size},
+                   "items": [comment(video_id, i) for i in range(start, end)]}
+        if end < comments:
+            payload["nextPageToken"] = f"p{end}"
+        return respond(payload)
+
+    @app.route("/stats")
+    def get_stats():
+        return jsonify(stats)
+
+    return app
+
+
+def serve_in_background(host: str = "127.0.0.1", port: int = 0, **options):
+    """Start a fake API server on a thread; returns (server, base URL for YOUTUBE_API_BASE)"""
+    # Request lines would drown out the output of whatever is being measured
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server(host, port, create_app(**options), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/youtube/v3"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--comments", type=int, default=10000, help="comments per video")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many more seconds, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", default=SAMPLE_CSV, help="CSV with a text column to draw comments from")
+    args = parser.parse_args()
+
+    app = create_app(args.comments, args.latency, args.jitter, args.error_rate, args.seed, load_corpus(args.corpus))
+    print(f"Fake YouTube API on http://{args.host}:{args.port}/youtube/v3 "
+          f"({args.comments} comments per video)", file=sys.stderr)
+    make_server(args.host, args.port, app, threaded=True).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+
+# Load .env file if exists
+if os.path.exists(".env"):
+    with open(".env") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                key, value = line.strip().split("=", 1)
+                os.environ[key] = value
+
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+# Base URL of the YouTube Data API; point it at benchmarks/fake_youtube_api.py
+# for offline load and benchmark runs
+YOUTUBE_API_BASE = os.getenv("YOUTUBE_API_BASE", "https://www.googleapis.com/youtube/v3").rstrip("/")
+YOUTUBE_POOL_SIZE = int(os.getenv("YOUTUBE_POOL_SIZE", "10"))
+# Raw commentThreads pages downloaded ahead of the page being processed
+FETCH_PREFETCH_PAGES = int(os.getenv("FETCH_PREFETCH_PAGES", "4"))
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+# Per-video comment tables kept between runs for incremental re-analysis
+STATE_DIR = os.path.join(BASE_DIR, "state")
+# An incremental run fetches newest first and stops at the first stored,
+# unedited comment, so it only sees new comments and edits newer than that
+# one; older edits and deleted comments only show up in a full fetch. A
+# table whose last full fetch is older than this many hours is fetched in
+# full again (0 never forces one).
+STATE_MAX_AGE_HOURS = float(os.getenv("STATE_MAX_AGE_HOURS", "168"))
+
+# Each run writes into OUTPUT_DIR/<video_id>/<run_id>; older runs of a video
+# beyond MAX_RUNS_PER_VIDEO are pruned when a new one starts.
+MAX_RUNS_PER_VIDEO = int(os.getenv("MAX_RUNS_PER_VIDEO", "5"))
+
+# Sentiment scoring runs on a process pool; 0 or 1 scores inline
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", str(min(4, os.cpu_count() or 1))))
+SENTIMENT_CHUNK_SIZE = int(os.getenv("SENTIMENT_CHUNK_SIZE", "200"))
+# Scores memoized by normalized comment text: an in-process LRU of
+# SENTIMENT_CACHE_SIZE entries (0 disables) over an optional SQLite store
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "200000"))
+SENTIMENT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH", os.path.join(CACHE_DIR, "sentiment.sqlite"))
+# The SQLite store keeps at most this many scores, dropping the least
+# recently written ones first (0 keeps every score)
+SENTIMENT_CACHE_MAX_ROWS = int(os.getenv("SENTIMENT_CACHE_MAX_ROWS", "1000000"))
+# Default engine when a request does not pick one: "textblob", or "lexicon"
+# for the vectorized re-implementation of TextBlob's lexicon rules
+SENTIMENT_SCORER = os.getenv("SENTIMENT_SCORER", "textblob")
+# /sentiment/batch accepts at most this many texts per call; /sentiment/stream
+# scores its NDJSON lines in batches of SENTIMENT_STREAM_BATCH
+SENTIMENT_BATCH_MAX_TEXTS = int(os.getenv("SENTIMENT_BATCH_MAX_TEXTS", "5000"))
+SENTIMENT_STREAM_BATCH = int(os.getenv("SENTIMENT_STREAM_BATCH", "500"))
+# "spawn" keeps pool workers independent of the threads running in the web process
+POOL_START_METHOD = os.getenv("POOL_START_METHOD", "spawn")
+
+# Chart stages render on their own process pool; 0 or 1 renders them
+# one after another on the job thread
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+# "lazy" keeps the run's comment table and draws each chart (and the PDF
+# report) the first time it is requested; "eager" renders all of them per run;
+# "data" renders none and leaves drawing to clients of /outputs/.../charts
+CHART_RENDERING = os.getenv("CHART_RENDERING", "lazy")
+
+# Background analysis jobs
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))
+MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", "20"))
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+# A finished analysis is handed to repeat requests with the same video and
+# options for this long instead of running again (0 disables)
+JOB_RESULT_CACHE_SECONDS = int(os.getenv("JOB_RESULT_CACHE_SECONDS", "120"))
+
+# On-disk cache of YouTube API responses; set API_CACHE_PATH to an empty
+# string to disable it. Fresh entries skip the network, stale ones are
+# revalidated with their ETag.
+API_CACHE_PATH = os.getenv("API_CACHE_PATH", os.path.join(CACHE_DIR, "youtube_api.sqlite"))
+API_CACHE_TTL_SECONDS = int(os.getenv("API_CACHE_TTL_SECONDS", "3600"))
+API_CACHE_MAX_AGE_SECONDS = int(os.getenv("API_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+API_CACHE_MAX_MB = int(os.getenv("API_CACHE_MAX_MB", "256"))
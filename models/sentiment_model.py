@@ -7,35 +7,36 @@ const SENTICA = () => {
   const [isVisible, setIsVisible] = useState(true);
   const [analysisData, setAnalysisData] = useState(null);
   const [availableOutputs, setAvailableOutputs] = useState([]);
+  const [pendingOutputs, setPendingOutputs] = useState([]);
+  const [outputsPath, setOutputsPath] = useState('');
   const [error, setError] = useState('');
   const [isAnalyzing, setIsAnalyzing] = useState(false);
+  const [progress, setProgress] = useState(0);
+  const [liveSummary, setLiveSummary] = useState('');
   const [imageStates, setImageStates] = useState({});
   const matrixRainRef = useRef(null);
   const analysisStarted = useRef(false);
+  const jobProgress = useRef({});
+  const finishedStages = useRef(new Set());
 
   const BACKEND_URL = 'http://localhost:5000';
 
-  const loadingMessages = [
-    "Connecting to YouTube API...",
-    "Fetching ALL video comments (unlimited)...",
-    "Processing natural language data...",
-    "Analyzing sentiment patterns...",
-    "Generating sentiment visualizations...",
-    "Creating word clouds...",
-    "Processing author engagement data...",
-    "Building temporal analysis...",
-    "Computing linguistic metrics...",
-    "Generating model evaluation...",
-    "Creating comprehensive reports...",
-    "Building interactive dashboard...",
-    "Finalizing all outputs..."
-  ];
+  const stageMessages = {
+    fetch_video_info: 'Connecting to YouTube API...',
+    ingest: 'Fetching ALL video comments (unlimited)...',
+    core_data: 'Saving core data exports...',
+    chart_data: 'Preparing chart data...',
+    reports: 'Creating comprehensive reports...',
+    executive_summary: 'Generating executive summary...',
+    zip: 'Finalizing all outputs...'
+  };
 
   const outputCategories = {
     core: {
       title: '📂 Core Data Exports',
       description: 'Raw data in various formats',
       files: [
+        { name: 'analysis.parquet', label: 'Parquet Table', desc: 'Columnar comment table for pandas, Arrow or DuckDB', icon: '🗃️' },
         { name: 'analysis.json', label: 'Raw JSON Analysis', desc: 'Complete analysis data in JSON format', icon: '📄' },
         { name: 'analysis.csv', label: 'CSV Export', desc: 'Comments with sentiment scores', icon: '📊' },
         { name: 'analysis.xlsx', label: 'Excel Spreadsheet', desc: 'Excel format for easy analysis', icon: '📈' },
@@ -166,19 +167,9 @@ const SENTICA = () => {
   }, []);
 
   useEffect(() => {
-    if (currentSection === 'loading' && isAnalyzing) {
-      let messageIndex = 0;
-      const interval = setInterval(() => {
-        setLoadingMessage(loadingMessages[messageIndex]);
-        messageIndex = (messageIndex + 1) % loadingMessages.length;
-      }, 4000);
-
-      if (!analysisStarted.current) {
-        analysisStarted.current = true;
-        analyzeWithBackend();
-      }
-
-      return () => clearInterval(interval);
+    if (currentSection === 'loading' && isAnalyzing && !analysisStarted.current) {
+      analysisStarted.current = true;
+      analyzeWithBackend();
     }
   }, [currentSection, isAnalyzing]);
 
@@ -192,14 +183,88 @@ const SENTICA = () => {
     }
   };
 
+  // Fetching and scoring fill the bar up to 70%, the output stages the backend plans the rest
+  const estimateProgress = (progress, finished) => {
+    const planned = progress.planned_stages || [];
+    if (planned.length) {
+      return 70 + 30 * planned.filter(name => finished.has(name)).length / planned.length;
+    }
+    const expected = progress.expected_comments || 0;
+    const scored = progress.total_comments || 0;
+    return expected ? 5 + 65 * Math.min(1, scored / expected) : Math.min(65, 5 + scored / 100);
+  };
+
+  const describeProgress = (progress) => {
+    const of = progress.expected_comments ? ` of ${progress.expected_comments.toLocaleString()}` : '';
+    return `${progress.total_comments.toLocaleString()}${of} comments scored • ` +
+      `${progress.pos || 0} positive · ${progress.neu || 0} neutral · ${progress.neg || 0} negative`;
+  };
+
+  const handleJobEvent = (type, data) => {
+    let progress = jobProgress.current;
+    if (type === 'snapshot') {
+      finishedStages.current = new Set(data.stages.filter(s => s.state !== 'running').map(s => s.name));
+      progress = data.progress || {};
+    } else if (type === 'progress') {
+      progress = data;
+    } else if (data.state === 'running') {
+      setLoadingMessage(stageMessages[data.name] || `Rendering ${data.name.replace(/_/g, ' ')}...`);
+    } else {
+      finishedStages.current.add(data.name);
+    }
+    jobProgress.current = progress;
+    if (progress.total_comments) setLiveSummary(describeProgress(progress));
+    setProgress(estimateProgress(progress, finishedStages.current));
+  };
+
+  // Follows the job's /events stream; falls back to polling when the stream cannot be opened
+  const followJob = (jobId, signal) => new Promise((resolve, reject) => {
+    const source = new EventSource(`${BACKEND_URL}/jobs/${jobId}/events`);
+    signal.addEventListener('abort', () => {
+      source.close();
+      reject(new DOMException('Analysis timed out', 'AbortError'));
+    });
+    ['snapshot', 'stage', 'progress'].forEach(type =>
+      source.addEventListener(type, event => handleJobEvent(type, JSON.parse(event.data))));
+    source.addEventListener('done', event => {
+      source.close();
+      resolve(JSON.parse(event.data));
+    });
+    source.addEventListener('failed', event => {
+      source.close();
+      reject(new Error(JSON.parse(event.data).error || 'Analysis failed'));
+    });
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        waitForJob(jobId, signal).then(resolve, reject);
+      }
+    };
+  });
+
+  const waitForJob = async (jobId, signal) => {
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, 2000));
+      const response = await fetch(`${BACKEND_URL}/jobs/${jobId}/result`, { signal });
+      if (response.status === 202) continue;
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.error || `HTTP ${response.status}`);
+      return data;
+    }
+  };
+
   const analyzeWithBackend = async (retryCount = 0) => {
     const maxRetries = 3;
     const controller = new AbortController();
-    const timeoutId = setTimeout(() => controller.abort(), 300000);
+    const timeoutId = setTimeout(() => controller.abort(), 1800000);
 
     try {
       console.log('Starting unlimited comment analysis...');
       setError('');
+      setProgress(0);
+      setLiveSummary('');
+      setLoadingMessage(stageMessages.fetch_video_info);
+      jobProgress.current = {};
+      finishedStages.current = new Set();
 
       const response = await fetch(`${BACKEND_URL}/analyze_video`, {
         method: 'POST',
@@ -210,18 +275,20 @@ const SENTICA = () => {
         signal: controller.signal
       });
 
-      clearTimeout(timeoutId);
-
       if (!response.ok) {
         const errorData = await response.json();
         throw new Error(errorData.error || `HTTP ${response.status}`);
       }
 
-      const data = await response.json();
+      const queued = await response.json();
+      const data = await followJob(queued.job_id, controller.signal);
+      clearTimeout(timeoutId);
       console.log('Analysis complete:', data);
 
       setAnalysisData(data.summary);
       setAvailableOutputs(data.outputs || []);
+      setPendingOutputs(data.pending_outputs || []);
+      setOutputsPath(data.outputs_path || '');
 
       setIsAnalyzing(false);
       setIsVisible(false);
@@ -278,6 +345,7 @@ const SENTICA = () => {
       setYoutubeUrl('');
       setAnalysisData(null);
       setAvailableOutputs([]);
+      setPendingOutputs([]);
       setError('');
       setIsAnalyzing(false);
       setIsVisible(true);
@@ -289,17 +357,36 @@ const SENTICA = () => {
     return youtubeRegex.test(url);
   };
 
-  const getImageUrl = (filename) => `${BACKEND_URL}/outputs/file/${filename}`;
-  const downloadFile = (filename) => window.open(`${BACKEND_URL}/outputs/file/${filename}`, '_blank');
-  const downloadAllOutputs = () => window.open(`${BACKEND_URL}/outputs/zip`, '_blank');
-  const openDashboard = () => window.open(`${BACKEND_URL}/outputs/file/dashboard.html`, '_blank');
+  const getImageUrl = (filename) => `${BACKEND_URL}${outputsPath}/file/${filename}`;
+  // Charts of a lazy run are drawn on first request; one these comments do not produce is dropped
+  const openPendingFile = async (filename) => {
+    const url = `${BACKEND_URL}${outputsPath}/file/${filename}`;
+    const tab = window.open('', '_blank');
+    try {
+      const response = await fetch(url, { method: 'HEAD' });
+      setPendingOutputs(prev => prev.filter(name => name !== filename));
+      if (response.ok) {
+        setAvailableOutputs(prev => [...prev, filename]);
+        if (tab) tab.location = url;
+        return;
+      }
+    } catch (err) {
+      console.error(`Could not render ${filename}:`, err);
+    }
+    if (tab) tab.close();
+  };
+  const downloadFile = (filename) => pendingOutputs.includes(filename)
+    ? openPendingFile(filename)
+    : window.open(`${BACKEND_URL}${outputsPath}/file/${filename}`, '_blank');
+  const downloadAllOutputs = () => window.open(`${BACKEND_URL}${outputsPath}/zip`, '_blank');
+  const openDashboard = () => window.open(`${BACKEND_URL}${outputsPath}/file/dashboard.html`, '_blank');
 
   const getAvailableFilesForCategory = (category) => {
-    return category.files.filter(file => availableOutputs.includes(file.name));
+    return category.files.filter(file => availableOutputs.includes(file.name) || pendingOutputs.includes(file.name));
   };
 
   const getUnavailableFilesForCategory = (category) => {
-    return category.files.filter(file => !availableOutputs.includes(file.name));
+    return category.files.filter(file => !availableOutputs.includes(file.name) && !pendingOutputs.includes(file.name));
   };
 
   const containerStyle = {
@@ -440,10 +527,10 @@ const SENTICA = () => {
           Analyzing ALL Comments...
         </div>
         <div style={{ width: '80%', maxWidth: '400px', height: '4px', background: 'rgba(255, 255, 255, 0.1)', borderRadius: '2px', margin: '1rem 0', overflow: 'hidden' }}>
-          <div style={{ height: '100%', background: 'linear-gradient(90deg, #00d4ff, #7b2cbf)', borderRadius: '2px', animation: 'loadingProgress 15s ease-in-out infinite' }}></div>
+          <div style={{ width: `${progress}%`, height: '100%', background: 'linear-gradient(90deg, #00d4ff, #7b2cbf)', borderRadius: '2px', transition: 'width 0.5s ease' }}></div>
         </div>
         <p style={{ color: '#8892b0', fontSize: '1rem', marginBottom: '1rem' }}>{loadingMessage}</p>
-        <p style={{ color: '#6b7280', fontSize: '0.9rem' }}>Processing unlimited comments and generating comprehensive analysis...</p>
+        <p style={{ color: '#6b7280', fontSize: '0.9rem' }}>{liveSummary || 'Processing unlimited comments and generating comprehensive analysis...'}</p>
       </div>
 
       {/* Results Section */}
@@ -530,32 +617,31 @@ const SENTICA = () => {
   const [isVisible, setIsVisible] = useState(true);
   const [analysisData, setAnalysisData] = useState(null);
   const [availableOutputs, setAvailableOutputs] = useState([]);
+  const [pendingOutputs, setPendingOutputs] = useState([]);
+  const [outputsPath, setOutputsPath] = useState('');
   const [error, setError] = useState('');
   const [isAnalyzing, setIsAnalyzing] = useState(false);
+  const [liveSummary, setLiveSummary] = useState('');
   const [mousePosition, setMousePosition] = useState({ x: 0, y: 0 });
   const [selectedCategory, setSelectedCategory] = useState(null);
   const [progress, setProgress] = useState(0);
   const canvasRef = useRef(null);
   const particlesRef = useRef([]);
   const analysisStarted = useRef(false);
+  const jobProgress = useRef({});
+  const finishedStages = useRef(new Set());
 
   const BACKEND_URL = 'http://localhost:5000';
 
-  const loadingMessages = [
-    "Connecting to YouTube API...",
-    "Fetching ALL video comments (unlimited)...",
-    "Processing natural language data...",
-    "Analyzing sentiment patterns...",
-    "Generating sentiment visualizations...",
-    "Creating word clouds...",
-    "Processing author engagement data...",
-    "Building temporal analysis...",
-    "Computing linguistic metrics...",
-    "Generating model evaluation...",
-    "Creating comprehensive reports...",
-    "Building interactive dashboard...",
-    "Finalizing all outputs..."
-  ];
+  const stageMessages = {
+    fetch_video_info: 'Connecting to YouTube API...',
+    ingest: 'Fetching ALL video comments (unlimited)...',
+    core_data: 'Saving core data exports...',
+    chart_data: 'Preparing chart data...',
+    reports: 'Creating comprehensive reports...',
+    executive_summary: 'Generating executive summary...',
+    zip: 'Finalizing all outputs...'
+  };
 
   const outputCategories = {
     core: {
@@ -563,6 +649,7 @@ const SENTICA = () => {
       icon: '📂',
       color: '#3b82f6',
       files: [
+        { name: 'analysis.parquet', label: 'Parquet Table', icon: '🗃️' },
         { name: 'analysis.json', label: 'JSON Analysis', icon: '📄' },
         { name: 'analysis.csv', label: 'CSV Export', icon: '📊' },
         { name: 'analysis.xlsx', label: 'Excel Sheet', icon: '📈' },
@@ -755,42 +842,95 @@ const SENTICA = () => {
     testBackendConnection();
   }, []);
 
-  // Loading progress simulation
+  // Progress comes from the job's event stream once the analysis is queued
   useEffect(() => {
-    if (currentSection === 'loading' && isAnalyzing) {
-      let messageIndex = 0;
-      let progressValue = 0;
-
-      const messageInterval = setInterval(() => {
-        setLoadingMessage(loadingMessages[messageIndex]);
-        messageIndex = (messageIndex + 1) % loadingMessages.length;
-      }, 4000);
-
-      const progressInterval = setInterval(() => {
-        progressValue += Math.random() * 5;
-        if (progressValue > 95) progressValue = 95;
-        setProgress(progressValue);
-      }, 500);
-
-      if (!analysisStarted.current) {
-        analysisStarted.current = true;
-        analyzeWithBackend();
+    if (currentSection === 'loading' && isAnalyzing && !analysisStarted.current) {
+      analysisStarted.current = true;
+      analyzeWithBackend();
+    }
+  }, [currentSection, isAnalyzing]);
+
+  // Fetching and scoring fill the bar up to 70%, the output stages the backend plans the rest
+  const estimateProgress = (progress, finished) => {
+    const planned = progress.planned_stages || [];
+    if (planned.length) {
+      return 70 + 30 * planned.filter(name => finished.has(name)).length / planned.length;
+    }
+    const expected = progress.expected_comments || 0;
+    const scored = progress.total_comments || 0;
+    return expected ? 5 + 65 * Math.min(1, scored / expected) : Math.min(65, 5 + scored / 100);
+  };
+
+  const describeProgress = (progress) => {
+    const of = progress.expected_comments ? ` of ${progress.expected_comments.toLocaleString()}` : '';
+    return `${progress.total_comments.toLocaleString()}${of} comments scored • ` +
+      `${progress.pos || 0} positive · ${progress.neu || 0} neutral · ${progress.neg || 0} negative`;
+  };
+
+  const handleJobEvent = (type, data) => {
+    let progress = jobProgress.current;
+    if (type === 'snapshot') {
+      finishedStages.current = new Set(data.stages.filter(s => s.state !== 'running').map(s => s.name));
+      progress = data.progress || {};
+    } else if (type === 'progress') {
+      progress = data;
+    } else if (data.state === 'running') {
+      setLoadingMessage(stageMessages[data.name] || `Rendering ${data.name.replace(/_/g, ' ')}...`);
+    } else {
+      finishedStages.current.add(data.name);
+    }
+    jobProgress.current = progress;
+    if (progress.total_comments) setLiveSummary(describeProgress(progress));
+    setProgress(estimateProgress(progress, finishedStages.current));
+  };
+
+  // Follows the job's /events stream; falls back to polling when the stream cannot be opened
+  const followJob = (jobId, signal) => new Promise((resolve, reject) => {
+    const source = new EventSource(`${BACKEND_URL}/jobs/${jobId}/events`);
+    signal.addEventListener('abort', () => {
+      source.close();
+      reject(new DOMException('Analysis timed out', 'AbortError'));
+    });
+    ['snapshot', 'stage', 'progress'].forEach(type =>
+      source.addEventListener(type, event => handleJobEvent(type, JSON.parse(event.data))));
+    source.addEventListener('done', event => {
+      source.close();
+      resolve(JSON.parse(event.data));
+    });
+    source.addEventListener('failed', event => {
+      source.close();
+      reject(new Error(JSON.parse(event.data).error || 'Analysis failed'));
+    });
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        waitForJob(jobId, signal).then(resolve, reject);
       }
+    };
+  });
 
-      return () => {
-        clearInterval(messageInterval);
-        clearInterval(progressInterval);
-      };
+  const waitForJob = async (jobId, signal) => {
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, 2000));
+      const response = await fetch(`${BACKEND_URL}/jobs/${jobId}/result`, { signal });
+      if (response.status === 202) continue;
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.error || `HTTP ${response.status}`);
+      return data;
     }
-  }, [currentSection, isAnalyzing]);
+  };
 
   const analyzeWithBackend = async (retryCount = 0) => {
     const maxRetries = 3;
     const controller = new AbortController();
-    const timeoutId = setTimeout(() => controller.abort(), 300000);
+    const timeoutId = setTimeout(() => controller.abort(), 1800000);
 
     try {
       setError('');
+      setProgress(0);
+      setLiveSummary('');
+      setLoadingMessage(stageMessages.fetch_video_info);
+      jobProgress.current = {};
+      finishedStages.current = new Set();
       const response = await fetch(`${BACKEND_URL}/analyze_video`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
@@ -798,16 +938,18 @@ const SENTICA = () => {
         signal: controller.signal
       });
 
-      clearTimeout(timeoutId);
-
       if (!response.ok) {
         const errorData = await response.json();
         throw new Error(errorData.error || `HTTP ${response.status}`);
       }
 
-      const data = await response.json();
+      const queued = await response.json();
+      const data = await followJob(queued.job_id, controller.signal);
+      clearTimeout(timeoutId);
       setAnalysisData(data.summary);
       setAvailableOutputs(data.outputs || []);
+      setPendingOutputs(data.pending_outputs || []);
+      setOutputsPath(data.outputs_path || '');
       setProgress(100);
 
       setTimeout(() => {
@@ -866,6 +1008,7 @@ const SENTICA = () => {
       setYoutubeUrl('');
       setAnalysisData(null);
       setAvailableOutputs([]);
+      setPendingOutputs([]);
       setError('');
       setIsAnalyzing(false);
       setSelectedCategory(null);
@@ -873,8 +1016,27 @@ const SENTICA = () => {
     }, 300);
   };
 
-  const downloadFile = (filename) => window.open(`${BACKEND_URL}/outputs/file/${filename}`, '_blank');
-  const downloadAllOutputs = () => window.open(`${BACKEND_URL}/outputs/zip`, '_blank');
+  // Charts of a lazy run are drawn on first request; one these comments do not produce is dropped
+  const openPendingFile = async (filename) => {
+    const url = `${BACKEND_URL}${outputsPath}/file/${filename}`;
+    const tab = window.open('', '_blank');
+    try {
+      const response = await fetch(url, { method: 'HEAD' });
+      setPendingOutputs(prev => prev.filter(name => name !== filename));
+      if (response.ok) {
+        setAvailableOutputs(prev => [...prev, filename]);
+        if (tab) tab.location = url;
+        return;
+      }
+    } catch (err) {
+      console.error(`Could not render ${filename}:`, err);
+    }
+    if (tab) tab.close();
+  };
+  const downloadFile = (filename) => pendingOutputs.includes(filename)
+    ? openPendingFile(filename)
+    : window.open(`${BACKEND_URL}${outputsPath}/file/${filename}`, '_blank');
+  const downloadAllOutputs = () => window.open(`${BACKEND_URL}${outputsPath}/zip`, '_blank');
 
   return (
     <div style={{
@@ -1165,7 +1327,7 @@ const SENTICA = () => {
             color: '#6b7280',
             textAlign: 'center'
           }}>
-            Analyzing unlimited comments • Generating 40+ outputs
+            {liveSummary || 'Analyzing unlimited comments • Generating 40+ outputs'}
           </div>
         </div>
       )}
@@ -1290,7 +1452,7 @@ const SENTICA = () => {
 
             {availableOutputs.includes('dashboard.html') && (
               <button
-                onClick={() => window.open(`${BACKEND_URL}/outputs/file/dashboard.html`, '_blank')}
+                onClick={() => window.open(`${BACKEND_URL}${outputsPath}/file/dashboard.html`, '_blank')}
                 className="glass"
                 style={{
                   padding: '1.5rem 3rem',
@@ -1353,7 +1515,7 @@ const SENTICA = () => {
               gap: '2rem'
             }}>
               {Object.entries(outputCategories).map(([key, category], index) => {
-                const availableFiles = category.files.filter(f => availableOutputs.includes(f.name));
+                const availableFiles = category.files.filter(f => availableOutputs.includes(f.name) || pendingOutputs.includes(f.name));
                 
                 return (
                   <div
@@ -0,0 +1,81 @@
+import time
+from flask import Blueprint, Response, request, jsonify, json, stream_with_context
+from services.job_service import get_job
+
+jobs_bp = Blueprint("jobs", __name__)
+
+# An idle event stream gets a comment line this often so proxies keep it open
+EVENTS_HEARTBEAT_SECONDS = 15
+# Each stream is closed after this long and the browser reconnects with
+# Last-Event-ID, so no worker thread is held for a whole analysis
+EVENTS_STREAM_SECONDS = 60
+# Milliseconds EventSource waits before reconnecting to a closed stream
+EVENTS_RETRY_MS = 1000
+
+def _event(name: str, data: dict, event_id: int) -> str:
+    return f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+
+@jobs_bp.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = get_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+@jobs_bp.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    """Server-Sent Events for one job.
+
+    A "snapshot" of the job comes first, then a "stage" event whenever a
+    stage starts or finishes and a "progress" event (pages fetched, comments
+    scored, running sentiment counts) whenever its progress changes, and
+    finally "done" with the result or "failed" with the error.
+
+    A stream lasts at most EVENTS_STREAM_SECONDS. A reconnect whose
+    Last-Event-ID is the job's current version skips the snapshot."""
+    job = get_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    last_event_id = request.headers.get("Last-Event-ID", "")
+
+    def stream():
+        deadline = time.monotonic() + EVENTS_STREAM_SECONDS
+        version = job.version
+        last = job.to_dict()
+        yield f"retry: {EVENTS_RETRY_MS}\n\n"
+        if last_event_id != str(version) or last["state"] in ("done", "failed"):
+            yield _event("snapshot", last, version)
+        while last["state"] not in ("done", "failed"):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # The client reconnects and resumes from this version
+                return
+            current_version = job.wait_for_change(version, min(EVENTS_HEARTBEAT_SECONDS, remaining))
+            if current_version == version:
+                yield ": keep-alive\n\n"
+                continue
+            version, current = current_version, job.to_dict()
+            for i, stage in enumerate(current["stages"]):
+                if i >= len(last["stages"]) or last["stages"][i]["state"] != stage["state"]:
+                    yield _event("stage", stage, version)
+            if current["progress"] != last["progress"]:
+                yield _event("progress", current["progress"], version)
+            last = current
+        if last["state"] == "done":
+            yield _event("done", {"job_id": job.id, "state": job.state, **job.result}, version)
+        else:
+            yield _event("failed", {"job_id": job.id, "state": job.state, "error": job.error}, version)
+
+    return Response(stream_with_context(stream()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@jobs_bp.route("/jobs/<job_id>/result")
+def job_result(job_id):
+    job = get_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if job.state == "failed":
+        return jsonify({"error": job.error, "job_id": job.id, "state": job.state}), 500
+    if job.state != "done":
+        return jsonify(job.to_dict()), 202
+    return jsonify({"job_id": job.id, "state": job.state, **job.result})
@@ -0,0 +1,11 @@
+from flask import Blueprint, Response
+from services import metrics
+from services.job_service import pending_jobs
+
+metrics_bp = Blueprint("metrics", __name__)
+
+@metrics_bp.route("/metrics")
+def get_metrics():
+    """Pipeline counters and histograms in the Prometheus text format"""
+    metrics.set_gauge("sentica_jobs_pending", pending_jobs())
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
@@ -1,8 +1,15 @@
-from flask import Blueprint, request, jsonify
-from services.sentiment_service import analyze_sentiment
+import json
+from collections import deque
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from config import SENTIMENT_BATCH_MAX_TEXTS, SENTIMENT_STREAM_BATCH
+from services.sentiment_service import analyze_sentiment, score_texts, submit_texts, resolve_scorer
+from services.sentiment_cache import CacheStats
 
 sentiment_bp = Blueprint("sentiment", __name__)
 
+# Stream batches allowed to wait on the scoring pool before reading pauses
+MAX_STREAM_BATCHES = 4
+
 @sentiment_bp.route("/sentiment", methods=["POST"])
 def sentiment_analysis():
     data = request.get_json()
@@ -11,5 +18,101 @@ def sentiment_analysis():
         return jsonify({"error": "No text provided"}), 400
 
     text = data["text"]
-    result = analyze_sentiment(text)
+    try:
+        result = analyze_sentiment(text, data.get("scorer"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(result)
+
+def score_results(scores) -> list[dict]:
+    """One result dict per text from score_texts' (polarity, subjectivity, labels) arrays"""
+    polarity, subjectivity, labels = scores
+    return [{"sentiment": label, "polarity": round(p, 4), "subjectivity": round(s, 4)}
+            for p, s, label in zip(polarity.tolist(), subjectivity.tolist(), labels)]
+
+def _options(args) -> tuple[str, float]:
+    """Scorer and label threshold of a request; raises ValueError when invalid"""
+    scorer = resolve_scorer(args.get("scorer"))
+    try:
+        threshold = float(args.get("threshold", 0.0))
+    except (TypeError, ValueError):
+        raise ValueError("threshold must be a number")
+    return scorer, threshold
+
+@sentiment_bp.route("/sentiment/batch", methods=["POST"])
+def sentiment_batch():
+    """Score up to SENTIMENT_BATCH_MAX_TEXTS texts in one call"""
+    data = request.get_json(silent=True) or {}
+    texts = data.get("texts")
+
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return jsonify({"error": "texts must be a list of strings"}), 400
+    if len(texts) > SENTIMENT_BATCH_MAX_TEXTS:
+        return jsonify({"error": f"At most {SENTIMENT_BATCH_MAX_TEXTS} texts per batch"}), 413
+    try:
+        scorer, threshold = _options(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    stats = CacheStats()
+    results = score_results(score_texts(texts, threshold=threshold, stats=stats, scorer=scorer))
+    return jsonify({"scorer": scorer, "count": len(results), "results": results, "cache": stats.to_dict()})
+
+def _parse_line(line: bytes):
+    """Text and optional id of one NDJSON line: a JSON string or {"text": ..., "id": ...}"""
+    item = json.loads(line)
+    if isinstance(item, str):
+        return item, None
+    if isinstance(item, dict) and isinstance(item.get("text"), str):
+        return item["text"], item.get("id")
+    raise ValueError('expected a JSON string or an object with a "text" string')
+
+@sentiment_bp.route("/sentiment/stream", methods=["POST"])
+def sentiment_stream():
+    """Score an NDJSON body line by line and stream NDJSON results back.
+
+    Lines are scored in batches of SENTIMENT_STREAM_BATCH; each batch is sent
+    to the scorer as soon as it is full, so results flow back while the
+    client is still uploading. Results keep the input order; a line that is
+    not valid JSON yields an error object instead of aborting the stream."""
+    try:
+        scorer, threshold = _options(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    body = request.stream
+
+    def generate():
+        pending, batch = deque(), []
+
+        def flush():
+            texts = [item[1] for item in batch if "error" not in item[2]]
+            pending.append((list(batch), submit_texts(texts, threshold=threshold, scorer=scorer)))
+            batch.clear()
+
+        def emit(entries, future):
+            results = iter(score_results(future.result()))
+            for line_no, _, extra in entries:
+                item = extra if "error" in extra else {**extra, **next(results)}
+                yield json.dumps({"line": line_no, **item}) + "\n"
+
+        line_no = 0
+        for line in body:
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                text, item_id = _parse_line(line)
+                batch.append((line_no, text, {} if item_id is None else {"id": item_id}))
+            except ValueError as e:
+                batch.append((line_no, None, {"error": str(e)}))
+            if len(batch) >= SENTIMENT_STREAM_BATCH:
+                flush()
+            while pending and (pending[0][1].done() or len(pending) > MAX_STREAM_BATCHES):
+                yield from emit(*pending.popleft())
+        if batch:
+            flush()
+        while pending:
+            yield from emit(*pending.popleft())
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
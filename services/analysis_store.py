@@ -0,0 +1,62 @@
+import os, re, time
+import pandas as pd
+from config import STATE_DIR, STATE_MAX_AGE_HOURS
+from services.frame_schema import write_table, read_table
+
+VIDEO_ID_RE = re.compile(r"^[0-9A-Za-z_-]+$")
+# Table attribute holding when its comments were last fetched in full (epoch seconds)
+FULL_FETCH_ATTR = "full_fetch_at"
+
+
+def _table_path(video_id: str) -> str:
+    if not VIDEO_ID_RE.match(video_id):
+        raise ValueError(f"Invalid video id: {video_id!r}")
+    return os.path.join(STATE_DIR, f"{video_id}.parquet")
+
+
+def load_comment_table(video_id: str) -> pd.DataFrame | None:
+    """Per-comment analysis table stored by the previous run of a video"""
+    path = _table_path(video_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        df = read_table(path)
+    except Exception as e:
+        print(f"Ignoring unreadable comment table for {video_id}: {e}")
+        return None
+    if not {"comment_id", "datetime"} <= set(df.columns) or df.empty:
+        return None
+    return df
+
+
+def save_comment_table(video_id: str, df: pd.DataFrame):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    write_table(df, _table_path(video_id))
+
+
+def is_stale(stored: pd.DataFrame, max_age_hours: float = STATE_MAX_AGE_HOURS) -> bool:
+    """Whether a stored table is due for a full fetch (see STATE_MAX_AGE_HOURS)"""
+    if max_age_hours <= 0:
+        return False
+    fetched_at = stored.attrs.get(FULL_FETCH_ATTR)
+    return fetched_at is None or time.time() - fetched_at > max_age_hours * 3600
+
+
+def new_comments(pages, known: dict):
+    """Pages of comments (newest first) reduced to those not in known with the same updated_at.
+
+    Stops after the page holding the first known, unedited comment: the
+    comments below it are assumed unchanged, so edits to them and deletions
+    are missed until the next full fetch."""
+    for page in pages:
+        fresh = [c for c in page if known.get(c["comment_id"]) != c["updated_at"]]
+        if fresh:
+            yield fresh
+        if len(fresh) < len(page):
+            return
+
+
+def merge_comment_tables(delta: pd.DataFrame, stored: pd.DataFrame) -> pd.DataFrame:
+    """Newly fetched comments followed by the stored ones they do not replace"""
+    kept = stored[~stored["comment_id"].isin(delta["comment_id"])]
+    return pd.concat([delta, kept], ignore_index=True)
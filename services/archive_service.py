@@ -0,0 +1,169 @@
+import os, hashlib, shutil, threading, zipfile
+
+ARCHIVE_NAME = "outputs.zip"
+CHUNK_SIZE = 64 * 1024
+# Formats that are compressed already; deflating them again only costs CPU
+STORED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".pdf", ".zip", ".xlsx", ".docx", ".parquet"}
+
+_builds = {}
+_builds_lock = threading.Lock()
+
+
+def archive_files(out_dir: str) -> list[tuple[str, int, int]]:
+    """(name, size, mtime) of every file of a run that goes into its archive"""
+    files = []
+    for name in sorted(os.listdir(out_dir)):
+        path = os.path.join(out_dir, name)
+        if name == ARCHIVE_NAME or name.startswith(".") or not os.path.isfile(path):
+            continue
+        stat = os.stat(path)
+        files.append((name, stat.st_size, stat.st_mtime_ns))
+    return files
+
+
+def archive_signature(files) -> str:
+    return hashlib.sha1(repr(files).encode()).hexdigest()
+
+
+def _cached_signature(path: str) -> str | None:
+    # The signature of the files an archive was built from is its ZIP comment
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return zf.comment.decode()
+    except (OSError, zipfile.BadZipFile):
+        return None
+
+
+class _AppendOnlyFile:
+    """Unseekable view of the archive being written.
+
+    On a seekable file zipfile goes back to patch each local header once the
+    entry is written; without seek() it writes data descriptors instead, so
+    bytes a downloader has already read never change."""
+
+    def __init__(self, f, build):
+        self._f, self._build = f, build
+
+    def write(self, data) -> int:
+        n = self._f.write(data)
+        self._f.flush()
+        self._build._grew(self._f.tell())
+        return n
+
+    def tell(self) -> int:
+        return self._f.tell()
+
+    def flush(self):
+        self._f.flush()
+
+
+class ArchiveBuild:
+    """One run's ZIP archive being written in the background.
+
+    The archive goes to a hidden partial file that any number of downloads
+    tail while it grows; when complete it replaces outputs.zip, which later
+    downloads are served from until the run's files change."""
+
+    def __init__(self, out_dir: str, files, signature: str):
+        self.out_dir, self.signature = out_dir, signature
+        self.path = os.path.join(out_dir, ARCHIVE_NAME)
+        self.partial_path = os.path.join(out_dir, f".{ARCHIVE_NAME}.{signature[:12]}.partial")
+        self.done, self.error = False, None
+        self._files, self._size = files, 0
+        self._cond = threading.Condition()
+        # Created before the thread starts so downloads can open it right away
+        self._raw = open(self.partial_path, "wb")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _grew(self, size: int):
+        with self._cond:
+            self._size = size
+            self._cond.notify_all()
+
+    def _run(self):
+        try:
+            with self._raw as raw:
+                with zipfile.ZipFile(_AppendOnlyFile(raw, self), "w") as zf:
+                    for name, _, _ in self._files:
+                        path = os.path.join(self.out_dir, name)
+                        info = zipfile.ZipInfo.from_file(path, arcname=name)
+                        stored = os.path.splitext(name)[1].lower() in STORED_EXTENSIONS
+                        info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+                        with open(path, "rb") as src, zf.open(info, "w") as dst:
+                            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                    zf.comment = self.signature.encode()
+        except Exception as e:
+            print(f"Error building archive of {self.out_dir}: {e}")
+            self.error = str(e)
+        with _builds_lock:
+            current = _builds.get(os.path.abspath(self.out_dir)) is self
+            if current:
+                del _builds[os.path.abspath(self.out_dir)]
+        with self._cond:
+            try:
+                # Downloads already tailing the partial file keep their handle
+                if self.error is None and current:
+                    os.replace(self.partial_path, self.path)
+                elif os.path.exists(self.partial_path):
+                    os.remove(self.partial_path)
+            except OSError as e:
+                # Windows refuses while a download still has the partial file open
+                print(f"Error finalizing archive of {self.out_dir}: {e}")
+                self.error = self.error or str(e)
+            finally:
+                # Whatever happened, downloads waiting on the archive must wake up
+                self.done = True
+                self._cond.notify_all()
+
+    def wait(self):
+        """Block until the archive is complete; raises if building it failed"""
+        self._thread.join()
+        if self.error:
+            raise RuntimeError(self.error)
+
+    def stream(self):
+        """Yield the archive chunk by chunk as it is written"""
+        with self._cond:
+            if self.done and self.error:
+                raise RuntimeError(self.error)
+            f = open(self.path if self.done else self.partial_path, "rb")
+        try:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if chunk:
+                    yield chunk
+                    continue
+                with self._cond:
+                    while not self.done and self._size <= f.tell():
+                        self._cond.wait()
+                    if self.done and self._size <= f.tell():
+                        if self.error:
+                            raise RuntimeError(self.error)
+                        return
+        finally:
+            f.close()
+
+
+def get_archive(out_dir: str) -> ArchiveBuild | None:
+    """The build of a run's archive in progress, started when outputs.zip is
+    missing or older than the run's files; None when outputs.zip is current."""
+    files = archive_files(out_dir)
+    signature = archive_signature(files)
+    key = os.path.abspath(out_dir)
+    with _builds_lock:
+        build = _builds.get(key)
+        if build is not None and build.signature == signature:
+            return build
+        if _cached_signature(os.path.join(out_dir, ARCHIVE_NAME)) == signature:
+            return None
+        build = _builds[key] = ArchiveBuild(out_dir, files, signature)
+        return build
+
+
+def build_archive(out_dir: str) -> str:
+    """Bring the run's outputs.zip up to date and return its name"""
+    build = get_archive(out_dir)
+    if build is not None:
+        build.wait()
+    return ARCHIVE_NAME
@@ -0,0 +1,234 @@
+import calendar
+import pandas as pd
+from services.charts import (VECTOR_POINT_LIMIT, SENTIMENT_ORDER, DAYS, cloud_frequencies, sentiment_counts,
+                             box_stats, emoji_counts, top_authors, top_liked, temporal_counts, comment_times,
+                             daily_engagement, confusion_matrix, classification_curves)
+from services.charts import histogram as bin_counts
+from services.text_stats import term_counts
+
+# The data behind each chart of services/charts.py as a small Vega-Lite-style
+# spec, keyed like the PNG it replaces ("sentiment_bar" for sentiment_bar.png),
+# so browsers can draw the charts without the server rendering any image.
+# The numbers come from the same aggregations the chart stages draw.
+
+
+def _values(frame: pd.DataFrame) -> list[dict]:
+    return frame.to_dict(orient="records")
+
+
+def spec(title, mark, values, x, y, **extra) -> dict:
+    """One chart: a mark over inline records, with (field, type) encodings for x and y"""
+    return {
+        "title": title,
+        "mark": mark,
+        "data": {"values": values},
+        "encoding": {"x": {"field": x[0], "type": x[1]}, "y": {"field": y[0], "type": y[1]}},
+        **extra
+    }
+
+
+def histogram(title, series, bins, color) -> dict:
+    counts, edges = bin_counts(series, bins)
+    values = [{"bin_start": float(a), "bin_end": float(b), "count": int(c)}
+              for a, b, c in zip(edges[:-1], edges[1:], counts)]
+    return spec(title, {"type": "bar", "color": color}, values, ("bin_start", "quantitative"),
+                ("count", "quantitative"), usermeta={"mean": float(series.mean()), "median": float(series.median())})
+
+
+def frequencies(title, pairs, field, color) -> dict:
+    values = [{field: key, "frequency": int(count)} for key, count in pairs]
+    return spec(title, {"type": "bar", "color": color}, values, ("frequency", "quantitative"), (field, "nominal"))
+
+
+def boxplot(title, df, column) -> dict:
+    """Five-number summary per sentiment, as the PNG's boxes and whiskers"""
+    values = [{"sentiment": box["label"], "q1": float(box["q1"]), "median": float(box["med"]), "q3": float(box["q3"]),
+               "lower": float(box["whislo"]), "upper": float(box["whishi"])} for box in box_stats(df, column)]
+    return spec(title, "boxplot", values, ("sentiment", "nominal"), ("median", "quantitative"))
+
+
+def sentiment_specs(df) -> dict:
+    specs = {}
+    counts = sentiment_counts(df)
+    if not counts.empty:
+        values = [{"sentiment": k, "count": int(v)} for k, v in counts.items()]
+        specs["sentiment_bar"] = spec("Sentiment Distribution", "bar", values,
+                                      ("sentiment", "nominal"), ("count", "quantitative"))
+        specs["sentiment_pie"] = spec("Sentiment Distribution", "arc", values,
+                                      ("sentiment", "nominal"), ("count", "quantitative"))
+    if 'polarity' in df.columns:
+        specs["avg_polarity_hist"] = histogram("Polarity Distribution", df['polarity'], 30, '#00d4ff')
+    if 'subjectivity' in df.columns:
+        specs["avg_subjectivity_hist"] = histogram("Subjectivity Distribution", df['subjectivity'], 30, '#7b2cbf')
+    return specs
+
+
+def relationship_specs(df) -> dict:
+    specs = {}
+    if 'likes' in df.columns and 'sentiment' in df.columns:
+        specs["likes_vs_sentiment"] = boxplot("Likes Distribution by Sentiment", df, 'likes')
+    if 'polarity' in df.columns and 'likes' in df.columns:
+        # Dense scatters are sampled so the payload stays small
+        points = df[['polarity', 'likes']]
+        if len(points) > VECTOR_POINT_LIMIT:
+            points = points.sample(VECTOR_POINT_LIMIT, random_state=0)
+        specs["polarity_vs_likes"] = spec("Polarity vs Likes", "point", _values(points),
+                                          ("polarity", "quantitative"), ("likes", "quantitative"),
+                                          usermeta={"total_points": len(df)})
+    if 'length' in df.columns and 'sentiment' in df.columns:
+        specs["sentiment_vs_comment_length"] = boxplot("Comment Length Distribution by Sentiment", df, 'length')
+    if 'length' in df.columns:
+        specs["comment_length_distribution"] = histogram("Comment Length Distribution", df['length'], 50, '#00d4ff')
+    return specs
+
+
+def emoji_specs(df) -> dict:
+    if 'emojis' not in df.columns:
+        return {}
+    counter = emoji_counts(df)
+    if not counter:
+        return {}
+    return {
+        "emoji_frequency": frequencies("Top 20 Most Frequent Emojis", counter.most_common(20), "emoji", '#ff006e'),
+        "emoji_wordcloud": frequencies("Emoji Word Cloud", counter.most_common(100), "emoji", '#7b2cbf')
+    }
+
+
+def wordcloud_specs(df) -> dict:
+    counts = term_counts(df)
+    clouds = [("wordcloud", "Overall Word Cloud", None)]
+    if 'sentiment' in df.columns:
+        clouds += [(f"{sentiment.lower()}_wordcloud", f"{sentiment} Word Cloud", (df['sentiment'] == sentiment).to_numpy())
+                   for sentiment in ['Positive', 'Negative', 'Neutral']]
+    specs = {}
+    for name, title, rows in clouds:
+        # The weights save_wordclouds lays out, capped like its max_words
+        top = list(cloud_frequencies(counts, rows).items())[:100]
+        if top:
+            specs[name] = frequencies(title, top, "word", '#00d4ff')
+    return specs
+
+
+def author_specs(df) -> dict:
+    specs = {}
+    authors = top_authors(df, 10)
+    if not authors.empty:
+        specs["top_authors"] = frequencies("Top 10 Authors by Comment Count", authors.items(), "author", '#00d4ff')
+    liked = top_liked(df, 10)
+    if not liked.empty:
+        specs["top_liked_comments"] = spec("Top 10 Most Liked Comments", {"type": "bar", "color": '#7b2cbf'},
+                                           _values(liked), ("likes", "quantitative"), ("author", "nominal"))
+    return specs
+
+
+def temporal_specs(df) -> dict:
+    if 'hour' not in df.columns:
+        return {}
+    specs = {}
+    counts = temporal_counts(df)
+    specs["hourly_distribution"] = spec("Comments by Hour of Day", {"type": "bar", "color": '#00d4ff'},
+                                        [{"hour": int(k), "count": int(v)} for k, v in counts['hour'].items()],
+                                        ("hour", "ordinal"), ("count", "quantitative"))
+    if 'day_of_week' in counts:
+        specs["daily_distribution"] = spec("Comments by Day of Week", {"type": "bar", "color": '#7b2cbf'},
+                                           [{"day": DAYS[k], "count": int(v)} for k, v in counts['day_of_week'].items()],
+                                           ("day", "ordinal"), ("count", "quantitative"))
+    if 'month' in counts:
+        monthly = counts['month']
+        specs["monthly_distribution"] = spec("Comments by Month", {"type": "bar", "color": '#ff006e'},
+                                             [{"month": calendar.month_abbr[k], "count": int(v)}
+                                              for k, v in monthly.items()],
+                                             ("month", "ordinal"), ("count", "quantitative"))
+    return specs
+
+
+def timeline_specs(df) -> dict:
+    if 'datetime' not in df.columns:
+        return {}
+    times = comment_times(df)
+    if times.empty:
+        return {}
+    # One point per day: the comment-level timeline grows with the comment count
+    daily = daily_engagement(times)
+    daily["date"] = daily["date"].astype(str)
+    daily[["total_likes", "comment_count", "cumulative"]] = daily[["total_likes", "comment_count", "cumulative"]].astype(int)
+    return {
+        "comment_timeline": spec("Cumulative Comment Timeline", {"type": "area", "color": '#00d4ff'},
+                                 _values(daily[["date", "cumulative"]]), ("date", "temporal"),
+                                 ("cumulative", "quantitative")),
+        "engagement_timeline": spec("Engagement Timeline (Likes vs Comments)", "line",
+                                    _values(daily[["date", "total_likes", "comment_count"]]), ("date", "temporal"),
+                                    ("total_likes", "quantitative"))
+    }
+
+
+def linguistic_specs(df) -> dict:
+    specs = {}
+    if 'length' in df.columns:
+        specs["comment_length_hist"] = histogram("Comment Length Distribution", df['length'], 30, '#00d4ff')
+    counts = term_counts(df)
+    if len(counts.words):
+        specs["word_frequency"] = frequencies("Top 20 Most Frequent Words", counts.most_common(20),
+                                              "word", '#7b2cbf')
+    if len(counts.bigrams):
+        specs["bigram_frequency"] = frequencies("Top 15 Most Frequent Bigrams", counts.most_common(15, "bigrams"),
+                                                "bigram", '#ff006e')
+    return specs
+
+
+def evaluation_specs(df) -> dict:
+    if 'polarity' not in df.columns:
+        return {}
+    matrix = confusion_matrix(df)
+    values = [{"true": SENTIMENT_ORDER[t], "predicted": SENTIMENT_ORDER[p], "count": int(matrix[t, p])}
+              for t in range(3) for p in range(3)]
+    return {"confusion_matrix": spec("Sentiment Classification Confusion Matrix", "rect", values,
+                                     ("predicted", "nominal"), ("true", "nominal"),
+                                     usermeta={"color_field": "count"})}
+
+
+def curve_specs(df) -> dict:
+    curves = classification_curves(df)
+    if not curves:
+        return {}
+    roc, pr, aucs = [], [], {}
+    for curve in curves:
+        label = curve["label"]
+        aucs[label] = curve["auc"]
+        roc.extend({"class": label, "fpr": float(a), "tpr": float(b)} for a, b in zip(curve["fpr"], curve["tpr"]))
+        pr.extend({"class": label, "recall": float(r), "precision": float(p)}
+                  for r, p in zip(curve["recall"], curve["precision"]))
+    return {
+        "roc_curve": spec("ROC Curve - Multiclass Sentiment", "line", roc, ("fpr", "quantitative"),
+                          ("tpr", "quantitative"), usermeta={"auc": aucs}),
+        "pr_curve": spec("Precision-Recall Curve", "line", pr, ("recall", "quantitative"), ("precision", "quantitative"))
+    }
+
+
+# (chart stage the specs stand in for, spec builder), in report order
+CHART_SPECS = [
+    ("sentiment_visualizations", sentiment_specs),
+    ("advanced_visualizations", relationship_specs),
+    ("wordclouds", wordcloud_specs),
+    ("emoji_analysis", emoji_specs),
+    ("author_analysis", author_specs),
+    ("temporal_analysis", temporal_specs),
+    ("timeline_analysis", timeline_specs),
+    ("linguistic_analysis", linguistic_specs),
+    ("model_evaluation", evaluation_specs),
+    ("advanced_model_evaluation", curve_specs),
+]
+
+
+def build_chart_specs(df: pd.DataFrame) -> dict:
+    """Every chart's spec; a failing builder is reported under "errors" instead of raising"""
+    charts, errors = {}, {}
+    if df.empty:
+        return {"charts": charts, "errors": errors}
+    for name, fn in CHART_SPECS:
+        try:
+            charts.update(fn(df))
+        except Exception as e:
+            print(f"Error building chart data for {name}: {e}")
+            errors[name] = str(e)
+    return {"charts": charts, "errors": errors}
@@ -0,0 +1,785 @@
+import os, json, calendar, threading
+from collections import Counter
+import pandas as pd, numpy as np, seaborn as sns
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib import cbook
+from matplotlib.figure import Figure
+from wordcloud import WordCloud, STOPWORDS
+from services.text_stats import term_counts
+from services.frame_schema import emoji_lists
+
+# Charts are drawn on standalone Figure objects rather than through pyplot,
+# so stages share no global state and can run in any thread or process.
+BACKGROUND = '#1a1f3a'
+matplotlib.style.use('dark_background')
+matplotlib.rcParams.update({
+    'figure.facecolor': BACKGROUND,
+    'axes.facecolor': BACKGROUND,
+    'text.color': 'white',
+    'axes.labelcolor': 'white',
+    'xtick.color': 'white',
+    'ytick.color': 'white'
+})
+
+# Above this many points scatter and line artists are rasterized inside vector
+# outputs (the PDF report); PNGs are unaffected
+VECTOR_POINT_LIMIT = 5000
+
+_figures = threading.local()
+
+def collect_figures():
+    """Keep every figure save_chart writes on this thread until collected_figures()"""
+    _figures.items = []
+
+def collected_figures() -> list:
+    """(filename, Figure) pairs written since collect_figures(), in order"""
+    items = getattr(_figures, "items", None) or []
+    _figures.items = None
+    return items
+
+def new_chart(figsize):
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+def save_chart(fig, out_dir, filename, files, **kwargs):
+    """Lay out and write one chart PNG, recording it in files"""
+    fig.tight_layout()
+    fig.savefig(os.path.join(out_dir, filename), facecolor=BACKGROUND, edgecolor='none', dpi=150, **kwargs)
+    files.append(filename)
+    if getattr(_figures, "items", None) is not None:
+        _figures.items.append((filename, fig))
+
+# ---------------------------- AGGREGATIONS ----------------------------
+# The numbers behind each chart, computed once per stage: the stage draws its
+# PNG from them and services/chart_data.py builds the chart's spec from them.
+
+SENTIMENT_ORDER = ['Negative', 'Neutral', 'Positive']
+SENTIMENT_COLORS = {'Negative': '#ff006e', 'Neutral': '#7b2cbf', 'Positive': '#00d4ff'}
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+def sentiment_counts(df) -> pd.Series:
+    counts = df["sentiment"].value_counts()
+    return counts[counts > 0]
+
+def histogram(series, bins) -> tuple[np.ndarray, np.ndarray]:
+    """Bin counts and edges, as Axes.hist computes them"""
+    return np.histogram(series, bins=bins)
+
+def draw_histogram(ax, counts, edges, **kwargs):
+    ax.hist(edges[:-1], bins=edges, weights=counts, **kwargs)
+
+def box_stats(df, column) -> list[dict]:
+    """matplotlib's box statistics of column for each sentiment present (whiskers at 1.5 IQR)"""
+    stats = []
+    for sentiment in SENTIMENT_ORDER:
+        data = df.loc[df['sentiment'] == sentiment, column].to_numpy()
+        if len(data):
+            stats.extend(cbook.boxplot_stats(data, labels=[sentiment]))
+    return stats
+
+def draw_boxplot(ax, stats):
+    bp = ax.bxp(stats, patch_artist=True)
+    for patch, box in zip(bp['boxes'], stats):
+        patch.set_facecolor(SENTIMENT_COLORS[box['label']])
+        patch.set_alpha(0.7)
+
+def comment_times(df) -> pd.DataFrame:
+    """datetime and likes of every dated comment, oldest first"""
+    return df[['datetime', 'likes']].dropna(subset=['datetime']).sort_values('datetime')
+
+def emoji_counts(df) -> Counter:
+    return Counter(e for emoji_list in emoji_lists(df['emojis']) for e in emoji_list)
+
+def top_authors(df, n) -> pd.Series:
+    return df['author'].value_counts().head(n)
+
+def top_liked(df, n) -> pd.DataFrame:
+    return df.nlargest(n, 'likes')[['author', 'text', 'likes', 'sentiment']]
+
+def temporal_counts(df) -> dict:
+    """Comments per hour, weekday and month (those columns the table has), in index order"""
+    return {col: df[col].value_counts().sort_index() for col in ('hour', 'day_of_week', 'month') if col in df.columns}
+
+def daily_engagement(times) -> pd.DataFrame:
+    """Per day: likes, comments and comments so far"""
+    daily = times.assign(date=times['datetime'].dt.date).groupby('date').agg(
+        total_likes=('likes', 'sum'), comment_count=('likes', 'size')).reset_index()
+    daily['cumulative'] = daily['comment_count'].cumsum()
+    return daily
+
+def confusion_matrix(df) -> np.ndarray:
+    """Counts of (true, predicted) sentiment, with polarity beyond +-0.1 as pseudo ground truth"""
+    true_idx = np.where(df['polarity'] > 0.1, 2, np.where(df['polarity'] < -0.1, 0, 1))
+    pred_idx = pd.Categorical(df['sentiment'].astype(str), categories=SENTIMENT_ORDER).codes
+    matrix = np.zeros((3, 3), dtype=np.int64)
+    np.add.at(matrix, (true_idx, pred_idx), 1)
+    return matrix
+
+def classification_curves(df) -> list[dict]:
+    """ROC and precision-recall curve of each sentiment, scoring polarity against thresholds;
+    empty below 10 labelled comments"""
+    from sklearn.preprocessing import label_binarize
+    from sklearn.metrics import roc_curve, auc, precision_recall_curve
+
+    y_true = df['sentiment'].map({'Negative': 0, 'Neutral': 1, 'Positive': 2}).dropna()
+    if len(y_true) < 10:
+        return []
+    # Use polarity as probability scores
+    y_scores = df.loc[y_true.index, 'polarity']
+    y_true_bin = label_binarize(y_true, classes=[0, 1, 2])
+    curves = []
+    for i, label in enumerate(SENTIMENT_ORDER):
+        y_score_binary = (y_scores > (i - 1) * 0.6).astype(int)
+        fpr, tpr, _ = roc_curve(y_true_bin[:, i], y_score_binary)
+        precision, recall, _ = precision_recall_curve(y_true_bin[:, i], y_score_binary)
+        curves.append({"label": label, "fpr": fpr, "tpr": tpr, "auc": float(auc(fpr, tpr)),
+                       "precision": precision, "recall": recall})
+    return curves
+
+# ---------------------------- CHART STAGES ----------------------------
+
+def save_sentiment_visualizations(df, out_dir):
+    """Save sentiment analysis visualizations"""
+    files = []
+    if df.empty:
+        return files
+
+    counts = sentiment_counts(df)
+
+    # Sentiment bar chart
+    if not counts.empty:
+        fig, ax = new_chart((10, 6))
+        colors = ['#00d4ff', '#ff006e', '#7b2cbf']
+        bars = ax.bar(counts.index, counts.values, color=colors[:len(counts)])
+        ax.set_title("Sentiment Distribution", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Sentiment", fontsize=12)
+        ax.set_ylabel("Count", fontsize=12)
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
+                    f'{int(height)}', ha='center', va='bottom', color='white')
+        save_chart(fig, out_dir, "sentiment_bar.png", files)
+
+    # Sentiment pie chart
+    if not counts.empty:
+        fig, ax = new_chart((8, 8))
+        colors = ['#00d4ff', '#ff006e', '#7b2cbf']
+        ax.pie(counts.values, labels=counts.index, autopct='%1.1f%%',
+               colors=colors[:len(counts)], startangle=90, textprops={'color': 'white'})
+        ax.set_title("Sentiment Distribution", fontsize=16, color='white', pad=20)
+        save_chart(fig, out_dir, "sentiment_pie.png", files)
+
+    # Sentiment ratios CSV
+    total = counts.sum()
+    if total > 0:
+        ratios = {
+            'positive_percentage': (counts.get('Positive', 0) / total) * 100,
+            'negative_percentage': (counts.get('Negative', 0) / total) * 100,
+            'neutral_percentage': (counts.get('Neutral', 0) / total) * 100
+        }
+        pd.DataFrame([ratios]).to_csv(os.path.join(out_dir, "sentiment_ratio.csv"), index=False)
+        files.append("sentiment_ratio.csv")
+
+    # Polarity histogram
+    if 'polarity' in df.columns:
+        fig, ax = new_chart((10, 6))
+        draw_histogram(ax, *histogram(df['polarity'], 30), color='#00d4ff', alpha=0.7, edgecolor='white')
+        ax.set_title("Polarity Distribution", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Polarity (-1 to 1)", fontsize=12)
+        ax.set_ylabel("Frequency", fontsize=12)
+        ax.axvline(df['polarity'].mean(), color='#ff006e', linestyle='--',
+                   label=f'Mean: {df["polarity"].mean():.3f}')
+        ax.legend()
+        save_chart(fig, out_dir, "avg_polarity_hist.png", files)
+
+    # Subjectivity histogram
+    if 'subjectivity' in df.columns:
+        fig, ax = new_chart((10, 6))
+        draw_histogram(ax, *histogram(df['subjectivity'], 30), color='#7b2cbf', alpha=0.7, edgecolor='white')
+        ax.set_title("Subjectivity Distribution", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Subjectivity (0 to 1)", fontsize=12)
+        ax.set_ylabel("Frequency", fontsize=12)
+        ax.axvline(df['subjectivity'].mean(), color='#ff006e', linestyle='--',
+                   label=f'Mean: {df["subjectivity"].mean():.3f}')
+        ax.legend()
+        save_chart(fig, out_dir, "avg_subjectivity_hist.png", files)
+
+    return files
+
+def save_advanced_visualizations(df, out_dir):
+    """Save advanced relationship visualizations"""
+    files = []
+    if df.empty:
+        return files
+
+    # 1. Likes vs Sentiment (Box plot)
+    if 'likes' in df.columns and 'sentiment' in df.columns:
+        fig, ax = new_chart((12, 7))
+        draw_boxplot(ax, box_stats(df, 'likes'))
+
+        ax.set_title("Likes Distribution by Sentiment", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Sentiment", fontsize=12)
+        ax.set_ylabel("Number of Likes", fontsize=12)
+        ax.grid(alpha=0.2)
+        save_chart(fig, out_dir, "likes_vs_sentiment.png", files)
+        print("Created likes vs sentiment visualization")
+
+    # 2. Polarity vs Likes (Scatter plot)
+    if 'polarity' in df.columns and 'likes' in df.columns:
+        fig, ax = new_chart((12, 7))
+        scatter = ax.scatter(df['polarity'], df['likes'], c=df['likes'],
+                             cmap='plasma', alpha=0.6, edgecolors='white', linewidth=0.5,
+                             rasterized=len(df) > VECTOR_POINT_LIMIT)
+        fig.colorbar(scatter, ax=ax, label='Likes')
+        ax.set_title("Polarity vs Likes", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Polarity (-1 to 1)", fontsize=12)
+        ax.set_ylabel("Number of Likes", fontsize=12)
+        ax.axvline(0, color='white', linestyle='--', alpha=0.3, label='Neutral')
+        ax.legend()
+        ax.grid(alpha=0.2)
+        save_chart(fig, out_dir, "polarity_vs_likes.png", files)
+        print("Created polarity vs likes visualization")
+
+    # 3. Sentiment vs Comment Length (Box plot)
+    if 'length' in df.columns and 'sentiment' in df.columns:
+        fig, ax = new_chart((12, 7))
+        draw_boxplot(ax, box_stats(df, 'length'))
+
+        ax.set_title("Comment Length Distribution by Sentiment", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Sentiment", fontsize=12)
+        ax.set_ylabel("Comment Length (characters)", fontsize=12)
+        ax.grid(alpha=0.2)
+        save_chart(fig, out_dir, "sentiment_vs_comment_length.png", files)
+        print("Created sentiment vs comment length visualization")
+
+    # 4. Comment Length Distribution (Enhanced histogram)
+    if 'length' in df.columns:
+        fig, ax = new_chart((12, 7))
+        draw_histogram(ax, *histogram(df['length'], 50), color='#00d4ff', alpha=0.7, edgecolor='white')
+        ax.axvline(df['length'].mean(), color='#ff006e', linestyle='--', linewidth=2,
+                   label=f'Mean: {df["length"].mean():.1f}')
+        ax.axvline(df['length'].median(), color='#7b2cbf', linestyle='--', linewidth=2,
+                   label=f'Median: {df["length"].median():.1f}')
+        ax.set_title("Comment Length Distribution", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Comment Length (characters)", fontsize=12)
+        ax.set_ylabel("Frequency", fontsize=12)
+        ax.legend()
+        ax.grid(alpha=0.2)
+        save_chart(fig, out_dir, "comment_length_distribution.png", files)
+        print("Created comment length distribution visualization")
+
+    return files
+
+def save_emoji_analysis(df, out_dir):
+    """Save emoji analysis - frequency data and visualizations"""
+    files = []
+    if df.empty or 'emojis' not in df.columns:
+        return files
+
+    counter = emoji_counts(df)
+    if not counter:
+        print("No emojis found in comments")
+        return files
+
+    # Emoji frequency analysis
+    emoji_freq = counter.most_common(50)
+    if emoji_freq:
+        # Save emoji frequency CSV
+        emoji_df = pd.DataFrame(emoji_freq, columns=['emoji', 'frequency'])
+        emoji_df.to_csv(os.path.join(out_dir, "emoji_frequency.csv"), index=False)
+        files.append("emoji_frequency.csv")
+        print(f"Saved emoji frequency CSV with {len(emoji_freq)} emojis")
+
+        # Create emoji frequency bar chart
+        if len(emoji_freq) >= 10:
+            fig, ax = new_chart((12, 8))
+            top_emojis = emoji_freq[:20]
+            emojis, freqs = zip(*top_emojis)
+
+            ax.barh(range(len(emojis)), freqs, color='#ff006e')
+            ax.set_yticks(range(len(emojis)), emojis, fontsize=16)
+            ax.set_title("Top 20 Most Frequent Emojis", fontsize=16, color='white', pad=20)
+            ax.set_xlabel("Frequency", fontsize=12)
+            ax.invert_yaxis()
+            save_chart(fig, out_dir, "emoji_frequency.png", files)
+            print("Created emoji frequency chart")
+
+    # Create emoji word cloud
+    if counter:
+        emoji_text = " ".join(counter)
+        # Check if we have actual content
+        if emoji_text.strip() and len(emoji_text.replace(" ", "")) > 0:
+            try:
+                wc = WordCloud(
+                    width=1200,
+                    height=800,
+                    background_color=BACKGROUND,
+                    colormap='plasma',
+                    max_words=100,
+                    relative_scaling=0.5,
+                    min_font_size=20,
+                    regexp=r"\S+",  # Match any non-whitespace
+                    collocations=False
+                ).generate_from_frequencies(dict(counter))
+
+                fig, ax = new_chart((15, 10))
+                ax.imshow(wc, interpolation='bilinear')
+                ax.axis('off')
+                ax.set_title("Emoji Word Cloud", fontsize=20, color='white', pad=20)
+                save_chart(fig, out_dir, "emoji_wordcloud.png", files, bbox_inches='tight')
+                print("Created emoji word cloud")
+            except Exception as e:
+                print(f"Error creating emoji wordcloud: {e}")
+                # Create alternative emoji visualization
+                try:
+                    top_15 = counter.most_common(15)
+                    if top_15:
+                        emojis_list, counts_list = zip(*top_15)
+
+                        fig, ax = new_chart((12, 8))
+                        ax.scatter(range(len(emojis_list)), counts_list,
+                                   s=[c*50 for c in counts_list],
+                                   c=counts_list, cmap='plasma', alpha=0.6)
+                        for i, (emoji, count) in enumerate(top_15):
+                            ax.annotate(emoji, (i, count), fontsize=20, ha='center', va='center')
+                        ax.set_title("Emoji Usage Bubble Chart", fontsize=16, color='white', pad=20)
+                        ax.set_xlabel("Emoji Rank", fontsize=12)
+                        ax.set_ylabel("Frequency", fontsize=12)
+                        save_chart(fig, out_dir, "emoji_wordcloud.png", files)
+                        print("Created emoji bubble chart as alternative")
+                except Exception as e2:
+                    print(f"Could not create emoji visualization: {e2}")
+
+    return files
+
+def cloud_frequencies(counts, rows=None) -> dict:
+    """Word cloud weights for the selected comments: word counts without stopwords or single characters.
+
+    Words are folded as WordCloud.process_text folds them: numbers are
+    dropped, a plural ("cats", but not "class") counts toward its singular
+    when both occur, and every casing of a word counts toward its most
+    frequent one, the first seen winning ties."""
+    freq = counts.frequencies("words", rows)
+    lower = freq.index.str.lower()
+    keep = ~lower.isin(STOPWORDS) & ~freq.index.str.isdigit()
+    freq, lower = freq[keep], lower[keep]
+    if freq.empty:
+        return {}
+    # Single characters still take plurals ("u" takes "us") before they are dropped
+    present = set(lower)
+    plural = np.array([w.endswith("s") and not w.endswith("ss") and w[:-1] in present for w in lower], dtype=bool)
+    words = pd.DataFrame({
+        "word": [w[:-1] if p else w for w, p in zip(freq.index, plural)],
+        "group": [w[:-1] if p else w for w, p in zip(lower, plural)],
+        "count": freq.to_numpy(),
+        # Ties go to the casing WordCloud meets first: a singular's own casings
+        # in text order, then those only its plural adds
+        "seen": counts.first_seen("words", rows)[freq.index].to_numpy() + plural * (counts.word_matrix.shape[0] + 1)
+    })
+    casings = words.groupby(["group", "word"], sort=False).agg(count=("count", "sum"), seen=("seen", "min"))
+    casings = casings.reset_index()
+    totals = casings.groupby("group", sort=False)["count"].sum()
+    top = casings.sort_values(["count", "seen"], ascending=[False, True])
+    top = top.drop_duplicates("group")
+    top = top[top["group"].str.len() > 1]
+    fused = pd.Series(totals[top["group"]].to_numpy(), index=top["word"].to_numpy())
+    return fused.sort_values(ascending=False, kind="stable").to_dict()
+
+def save_wordclouds(df, out_dir):
+    """Save word cloud visualizations"""
+    files = []
+    if df.empty:
+        return files
+
+    counts = term_counts(df)
+
+    def create_wordcloud(frequencies, filename, title):
+        if not frequencies:
+            print(f"Skipping {filename} - no meaningful words after cleaning")
+            return None
+
+        try:
+            wc = WordCloud(width=1200, height=800, background_color=BACKGROUND,
+                          colormap='plasma', max_words=100).generate_from_frequencies(frequencies)
+            fig, ax = new_chart((15, 10))
+            ax.imshow(wc, interpolation='bilinear')
+            ax.axis('off')
+            ax.set_title(title, fontsize=20, color='white', pad=20)
+            save_chart(fig, out_dir, filename, [], bbox_inches='tight')
+            print(f"Successfully created {filename}")
+            return filename
+        except ValueError as e:
+            print(f"Error creating {filename}: {e}")
+            return None
+        except Exception as e:
+            print(f"Unexpected error creating {filename}: {e}")
+            return None
+
+    # Overall and per-sentiment wordclouds, all from the same term counts
+    clouds = [("wordcloud.png", "Overall Word Cloud", None)]
+    if 'sentiment' in df.columns:
+        clouds += [(f"{sentiment.lower()}_wordcloud.png", f"{sentiment} Word Cloud", (df['sentiment'] == sentiment).to_numpy())
+                   for sentiment in ['Positive', 'Negative', 'Neutral']]
+    for filename, title, rows in clouds:
+        result = create_wordcloud(cloud_frequencies(counts, rows), filename, title)
+        if result:
+            files.append(result)
+
+    return files
+
+def save_author_analysis(df, out_dir):
+    """Save author and engagement analysis"""
+    files = []
+    if df.empty:
+        return files
+
+    # Top authors by comment count
+    authors = top_authors(df, 20)
+    if not authors.empty:
+        authors.to_csv(os.path.join(out_dir, "top_authors.csv"))
+        files.append("top_authors.csv")
+
+        # Top authors chart
+        fig, ax = new_chart((12, 8))
+        authors.head(10).plot(kind='bar', color='#00d4ff', ax=ax)
+        ax.set_title("Top 10 Authors by Comment Count", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Author", fontsize=12)
+        ax.set_ylabel("Number of Comments", fontsize=12)
+        for label in ax.get_xticklabels():
+            label.set(rotation=45, ha='right')
+        save_chart(fig, out_dir, "top_authors.png", files)
+
+    # Top liked comments
+    liked = top_liked(df, 20)
+    if not liked.empty:
+        liked.to_csv(os.path.join(out_dir, "top_liked_comments.csv"), index=False)
+        files.append("top_liked_comments.csv")
+
+        # Top liked comments chart
+        fig, ax = new_chart((12, 8))
+        top_10_liked = liked.head(10)
+        ax.barh(range(len(top_10_liked)), top_10_liked['likes'], color='#7b2cbf')
+        ax.set_yticks(range(len(top_10_liked)),
+                  [f"{row['author'][:15]}..." if len(row['author']) > 15 else row['author']
+                   for _, row in top_10_liked.iterrows()])
+        ax.set_title("Top 10 Most Liked Comments", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Likes", fontsize=12)
+        save_chart(fig, out_dir, "top_liked_comments.png", files)
+
+    # Engagement stats
+    engagement_stats = {
+        'total_likes': df['likes'].sum(),
+        'avg_likes_per_comment': df['likes'].mean(),
+        'median_likes': df['likes'].median(),
+        'max_likes': df['likes'].max(),
+        'comments_with_likes': len(df[df['likes'] > 0]),
+        'engagement_rate': len(df[df['likes'] > 0]) / len(df) if len(df) > 0 else 0
+    }
+    pd.DataFrame([engagement_stats]).to_csv(os.path.join(out_dir, "engagement_stats.csv"), index=False)
+    files.append("engagement_stats.csv")
+
+    return files
+
+def save_temporal_analysis(df, out_dir):
+    """Save temporal analysis charts"""
+    files = []
+    if df.empty or 'hour' not in df.columns:
+        return files
+
+    counts = temporal_counts(df)
+
+    # Hourly distribution
+    hourly_counts = counts['hour']
+    if not hourly_counts.empty:
+        fig, ax = new_chart((12, 6))
+        ax.bar(hourly_counts.index, hourly_counts.values, color='#00d4ff', alpha=0.7)
+        ax.set_title("Comments by Hour of Day", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Hour (24-hour format)", fontsize=12)
+        ax.set_ylabel("Number of Comments", fontsize=12)
+        ax.set_xticks(range(0, 24))
+        save_chart(fig, out_dir, "hourly_distribution.png", files)
+
+    # Daily distribution
+    if 'day_of_week' in counts:
+        daily_counts = counts['day_of_week']
+        if not daily_counts.empty:
+            fig, ax = new_chart((10, 6))
+            ax.bar([DAYS[i] for i in daily_counts.index], daily_counts.values, color='#7b2cbf', alpha=0.7)
+            ax.set_title("Comments by Day of Week", fontsize=16, color='white', pad=20)
+            ax.set_xlabel("Day of Week", fontsize=12)
+            ax.set_ylabel("Number of Comments", fontsize=12)
+            save_chart(fig, out_dir, "daily_distribution.png", files)
+
+    # Monthly distribution
+    if 'month' in counts:
+        monthly_counts = counts['month']
+        if not monthly_counts.empty:
+            fig, ax = new_chart((12, 6))
+            month_names = [calendar.month_abbr[i] for i in monthly_counts.index]
+            ax.bar(month_names, monthly_counts.values, color='#ff006e', alpha=0.7)
+            ax.set_title("Comments by Month", fontsize=16, color='white', pad=20)
+            ax.set_xlabel("Month", fontsize=12)
+            ax.set_ylabel("Number of Comments", fontsize=12)
+            save_chart(fig, out_dir, "monthly_distribution.png", files)
+
+    return files
+
+def save_timeline_analysis(df, out_dir):
+    """Save timeline visualizations"""
+    files = []
+    if df.empty or 'datetime' not in df.columns:
+        return files
+
+    df_time = comment_times(df)
+    if df_time.empty:
+        return files
+
+    # Comment timeline (cumulative)
+    fig, ax = new_chart((14, 7))
+    df_time = df_time.assign(cumulative=range(1, len(df_time) + 1))
+    dense = len(df_time) > VECTOR_POINT_LIMIT
+    ax.plot(df_time['datetime'], df_time['cumulative'], color='#00d4ff', linewidth=2, rasterized=dense)
+    ax.fill_between(df_time['datetime'], df_time['cumulative'], alpha=0.3, color='#00d4ff', rasterized=dense)
+    ax.set_title("Cumulative Comment Timeline", fontsize=16, color='white', pad=20)
+    ax.set_xlabel("Date", fontsize=12)
+    ax.set_ylabel("Total Comments", fontsize=12)
+    ax.grid(alpha=0.2)
+    save_chart(fig, out_dir, "comment_timeline.png", files)
+
+    # Engagement timeline
+    if 'likes' in df_time.columns:
+        # Likes and comments per day
+        daily = daily_engagement(df_time)
+
+        fig, ax1 = new_chart((14, 7))
+
+        ax1.set_xlabel('Date', fontsize=12)
+        ax1.set_ylabel('Total Likes', color='#ff006e', fontsize=12)
+        ax1.plot(daily['date'], daily['total_likes'],
+                color='#ff006e', linewidth=2, label='Likes')
+        ax1.tick_params(axis='y', labelcolor='#ff006e')
+        ax1.fill_between(daily['date'], daily['total_likes'],
+                        alpha=0.3, color='#ff006e')
+
+        ax2 = ax1.twinx()
+        ax2.set_ylabel('Comment Count', color='#00d4ff', fontsize=12)
+        ax2.plot(daily['date'], daily['comment_count'],
+                color='#00d4ff', linewidth=2, label='Comments', linestyle='--')
+        ax2.tick_params(axis='y', labelcolor='#00d4ff')
+
+        ax2.set_title("Engagement Timeline (Likes vs Comments)", fontsize=16, color='white', pad=20)
+        save_chart(fig, out_dir, "engagement_timeline.png", files)
+
+    return files
+
+def save_linguistic_analysis(df, out_dir):
+    """Save linguistic analysis"""
+    files = []
+    if df.empty:
+        return files
+
+    # Comment length histogram
+    if 'length' in df.columns:
+        fig, ax = new_chart((10, 6))
+        draw_histogram(ax, *histogram(df['length'], 30), color='#00d4ff', alpha=0.7, edgecolor='white')
+        ax.set_title("Comment Length Distribution", fontsize=16, color='white', pad=20)
+        ax.set_xlabel("Characters", fontsize=12)
+        ax.set_ylabel("Frequency", fontsize=12)
+        ax.axvline(df['length'].mean(), color='#ff006e', linestyle='--',
+                   label=f'Mean: {df["length"].mean():.1f}')
+        ax.legend()
+        save_chart(fig, out_dir, "comment_length_hist.png", files)
+
+    # Word frequency analysis
+    counts = term_counts(df)
+    if len(counts.words):
+        word_freq = counts.most_common(50)
+        pd.DataFrame(word_freq, columns=['word', 'frequency']).to_csv(
+            os.path.join(out_dir, "word_frequency.csv"), index=False)
+        files.append("word_frequency.csv")
+
+        # Word frequency chart
+        if len(word_freq) >= 20:
+            fig, ax = new_chart((12, 8))
+            top_20 = word_freq[:20]
+            words, freqs = zip(*top_20)
+            ax.barh(range(len(words)), freqs, color='#7b2cbf')
+            ax.set_yticks(range(len(words)), words)
+            ax.set_title("Top 20 Most Frequent Words", fontsize=16, color='white', pad=20)
+            ax.set_xlabel("Frequency", fontsize=12)
+            ax.invert_yaxis()
+            save_chart(fig, out_dir, "word_frequency.png", files)
+
+        # Bigram analysis
+        if len(counts.bigrams):
+            bigram_freq = counts.most_common(30, "bigrams")
+            pd.DataFrame(bigram_freq, columns=['bigram', 'frequency']).to_csv(
+                os.path.join(out_dir, "bigram_frequency.csv"), index=False)
+            files.append("bigram_frequency.csv")
+
+            # Bigram frequency chart
+            if len(bigram_freq) >= 15:
+                fig, ax = new_chart((12, 10))
+                top_15 = bigram_freq[:15]
+                bigrams_text, freqs = zip(*top_15)
+                ax.barh(range(len(bigrams_text)), freqs, color='#ff006e')
+                ax.set_yticks(range(len(bigrams_text)), bigrams_text)
+                ax.set_title("Top 15 Most Frequent Bigrams", fontsize=16, color='white', pad=20)
+                ax.set_xlabel("Frequency", fontsize=12)
+                ax.invert_yaxis()
+                save_chart(fig, out_dir, "bigram_frequency.png", files)
+
+    return files
+
+def save_model_evaluation(df, out_dir):
+    """Save model evaluation metrics with confusion matrix"""
+    files = []
+    if df.empty or 'sentiment' not in df.columns:
+        return files
+
+    # Classification metrics
+    counts = df['sentiment'].value_counts()
+    metrics = {
+        'total_samples': int(len(df)),
+        'positive_count': int(counts.get('Positive', 0)),
+        'negative_count': int(counts.get('Negative', 0)),
+        'neutral_count': int(counts.get('Neutral', 0)),
+        'positive_percentage': float((counts.get('Positive', 0) / len(df)) * 100),
+        'negative_percentage': float((counts.get('Negative', 0) / len(df)) * 100),
+        'neutral_percentage': float((counts.get('Neutral', 0) / len(df)) * 100),
+        'average_polarity': float(df['polarity'].mean()) if 'polarity' in df.columns else 0.0,
+        'polarity_std': float(df['polarity'].std()) if 'polarity' in df.columns else 0.0
+    }
+
+    # Save metrics as JSON
+    with open(os.path.join(out_dir, "classification_metrics.json"), 'w') as f:
+        json.dump(metrics, f, indent=2)
+    files.append("classification_metrics.json")
+
+    # Save metrics as CSV
+    pd.DataFrame([metrics]).to_csv(os.path.join(out_dir, "classification_metrics.csv"), index=False)
+    files.append("classification_metrics.csv")
+
+    # Confusion matrix visualization
+    if 'polarity' in df.columns:
+        # Create pseudo confusion matrix based on polarity thresholds
+        labels = SENTIMENT_ORDER
+        matrix = confusion_matrix(df)
+
+        if matrix.sum() > 0:
+            fig, ax = new_chart((10, 8))
+            sns.heatmap(matrix, annot=True, fmt='g', cmap='Blues',
+                       xticklabels=labels, yticklabels=labels,
+                       cbar_kws={'label': 'Count'}, ax=ax)
+            ax.set_title("Sentiment Classification Confusion Matrix", fontsize=16, color='white', pad=20)
+            ax.set_xlabel("Predicted Sentiment", fontsize=12)
+            ax.set_ylabel("True Sentiment (based on polarity)", fontsize=12)
+            save_chart(fig, out_dir, "confusion_matrix.png", files)
+            print("Created confusion matrix visualization")
+
+            # Normalized confusion matrix
+            fig, ax = new_chart((10, 8))
+            matrix_normalized = matrix / matrix.sum(axis=1, keepdims=True)
+            sns.heatmap(matrix_normalized, annot=True, fmt='.2%', cmap='Greens',
+                       xticklabels=labels, yticklabels=labels,
+                       cbar_kws={'label': 'Percentage'}, ax=ax)
+            ax.set_title("Normalized Confusion Matrix (by Row)", fontsize=16, color='white', pad=20)
+            ax.set_xlabel("Predicted Sentiment", fontsize=12)
+            ax.set_ylabel("True Sentiment", fontsize=12)
+            save_chart(fig, out_dir, "confusion_matrix_normalized.png", files)
+            print("Created normalized confusion matrix")
+
+            # Precision-focused matrix
+            fig, ax = new_chart((10, 8))
+            matrix_precision = matrix / matrix.sum(axis=0, keepdims=True)
+            sns.heatmap(matrix_precision, annot=True, fmt='.2%', cmap='Purples',
+                       xticklabels=labels, yticklabels=labels,
+                       cbar_kws={'label': 'Precision'}, ax=ax)
+            ax.set_title("Precision Matrix (by Column)", fontsize=16, color='white', pad=20)
+            ax.set_xlabel("Predicted Sentiment", fontsize=12)
+            ax.set_ylabel("True Sentiment", fontsize=12)
+            save_chart(fig, out_dir, "confusion_matrix_precision.png", files)
+            print("Created precision-focused confusion matrix")
+
+    return files
+
+def save_advanced_model_evaluation(df, out_dir):
+    """Save ROC and PR curves"""
+    files = []
+    if df.empty or 'sentiment' not in df.columns or 'polarity' not in df.columns:
+        return files
+
+    try:
+        curves = classification_curves(df)
+        if not curves:
+            return files
+
+        # ROC Curve
+        fig, ax = new_chart((10, 8))
+        for curve in curves:
+            ax.plot(curve['fpr'], curve['tpr'], color=SENTIMENT_COLORS[curve['label']], linewidth=2,
+                    label=f"{curve['label']} (AUC = {curve['auc']:.2f})")
+
+        ax.plot([0, 1], [0, 1], 'white', linestyle='--', linewidth=1, alpha=0.5)
+        ax.set_xlim([0.0, 1.0])
+        ax.set_ylim([0.0, 1.05])
+        ax.set_xlabel('False Positive Rate', fontsize=12)
+        ax.set_ylabel('True Positive Rate', fontsize=12)
+        ax.set_title('ROC Curve - Multiclass Sentiment', fontsize=16, color='white', pad=20)
+        ax.legend(loc="lower right")
+        ax.grid(alpha=0.2)
+        save_chart(fig, out_dir, "roc_curve.png", files)
+
+        # PR Curve
+        fig, ax = new_chart((10, 8))
+        for curve in curves:
+            ax.plot(curve['recall'], curve['precision'], color=SENTIMENT_COLORS[curve['label']], linewidth=2,
+                    label=curve['label'])
+
+        ax.set_xlabel('Recall', fontsize=12)
+        ax.set_ylabel('Precision', fontsize=12)
+        ax.set_title('Precision-Recall Curve', fontsize=16, color='white', pad=20)
+        ax.legend(loc="best")
+        ax.grid(alpha=0.2)
+        save_chart(fig, out_dir, "pr_curve.png", files)
+
+    except Exception as e:
+        print(f"Error creating ROC/PR curves: {e}")
+
+    return files
+
+# (stage name, progress message, save function) for the chart stages, in report order
+CHART_STAGES = [
+    ("sentiment_visualizations", "Creating sentiment visualizations...", save_sentiment_visualizations),
+    ("advanced_visualizations", "Creating advanced relationship visualizations...", save_advanced_visualizations),
+    ("wordclouds", "Generating word clouds...", save_wordclouds),
+    ("emoji_analysis", "Analyzing emoji usage...", save_emoji_analysis),
+    ("author_analysis", "Processing author and engagement data...", save_author_analysis),
+    ("temporal_analysis", "Building temporal analysis...", save_temporal_analysis),
+    ("timeline_analysis", "Building timeline visualizations...", save_timeline_analysis),
+    ("linguistic_analysis", "Computing linguistic analysis...", save_linguistic_analysis),
+    ("model_evaluation", "Generating model evaluation with confusion matrices...", save_model_evaluation),
+    ("advanced_model_evaluation", "Creating advanced model evaluation...", save_advanced_model_evaluation),
+]
+
+# Every file a chart stage can write, so one missing output can be produced by
+# running only the stage that owns it
+STAGE_FILES = {
+    "sentiment_visualizations": ["sentiment_bar.png", "sentiment_pie.png", "sentiment_ratio.csv",
+                                 "avg_polarity_hist.png", "avg_subjectivity_hist.png"],
+    "advanced_visualizations": ["likes_vs_sentiment.png", "polarity_vs_likes.png",
+                                "sentiment_vs_comment_length.png", "comment_length_distribution.png"],
+    "wordclouds": ["wordcloud.png", "positive_wordcloud.png", "negative_wordcloud.png", "neutral_wordcloud.png"],
+    "emoji_analysis": ["emoji_frequency.csv", "emoji_frequency.png", "emoji_wordcloud.png"],
+    "author_analysis": ["top_authors.csv", "top_authors.png", "top_liked_comments.csv",
+                        "top_liked_comments.png", "engagement_stats.csv"],
+    "temporal_analysis": ["hourly_distribution.png", "daily_distribution.png", "monthly_distribution.png"],
+    "timeline_analysis": ["comment_timeline.png", "engagement_timeline.png"],
+    "linguistic_analysis": ["comment_length_hist.png", "word_frequency.csv", "word_frequency.png",
+                            "bigram_frequency.csv", "bigram_frequency.png"],
+    "model_evaluation": ["classification_metrics.json", "classification_metrics.csv", "confusion_matrix.png",
+                         "confusion_matrix_normalized.png", "confusion_matrix_precision.png"],
+    "advanced_model_evaluation": ["roc_curve.png", "pr_curve.png"],
+}
+CHART_FILES = {filename: stage for stage, filenames in STAGE_FILES.items() for filename in filenames}
@@ -0,0 +1,77 @@
+import os, threading
+import numpy as np
+import pandas as pd
+
+SENTIMENTS = ["Negative", "Neutral", "Positive"]
+
+# Narrowest dtype of each numeric column of the comment table
+COMPACT_DTYPES = {
+    "likes": np.int32,
+    "length": np.int32,
+    "polarity": np.float32,
+    "subjectivity": np.float32,
+    "hour": np.int8,
+    "day_of_week": np.int8,
+    "month": np.int8,
+}
+
+
+def _joined_emojis(values) -> list[str]:
+    # Emoji sequences never contain a space, so one string per comment round-trips
+    return [" ".join(v) if isinstance(v, (list, tuple, np.ndarray)) else (v if isinstance(v, str) else "")
+            for v in values]
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink the comment table in place for long-lived copies (workers, stored state).
+
+    Sentiment and author become categoricals, scores float32 and counters
+    the smallest integer that holds them. Each comment's emoji list becomes
+    one space-separated string stored as a categorical, so the many
+    comments with no (or the same) emoji share a single value; emoji_lists()
+    turns the column back into lists."""
+    if df.empty:
+        return df
+    for col, dtype in COMPACT_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+    if "sentiment" in df.columns and not isinstance(df["sentiment"].dtype, pd.CategoricalDtype):
+        df["sentiment"] = pd.Categorical(df["sentiment"].astype(str), categories=SENTIMENTS)
+    if "author" in df.columns and not isinstance(df["author"].dtype, pd.CategoricalDtype):
+        df["author"] = df["author"].astype(str).astype("category")
+    if "emojis" in df.columns and not isinstance(df["emojis"].dtype, pd.CategoricalDtype):
+        df["emojis"] = pd.Categorical(_joined_emojis(df["emojis"]))
+    return df
+
+
+def emoji_lists(emojis: pd.Series) -> list[list[str]]:
+    """Per-comment emoji lists from a compact or a plain list column"""
+    if isinstance(emojis.dtype, pd.CategoricalDtype):
+        lists = [c.split() for c in emojis.cat.categories]
+        return [lists[code] if code >= 0 else [] for code in emojis.cat.codes.tolist()]
+    return [list(v) if isinstance(v, (list, tuple, np.ndarray)) else
+            (v.split() if isinstance(v, str) else []) for v in emojis]
+
+
+def frame_memory(df: pd.DataFrame) -> dict:
+    """Deep memory footprint of a frame, in bytes, overall and per column"""
+    usage = df.memory_usage(deep=True, index=True)
+    total = int(usage.sum())
+    return {
+        "rows": len(df),
+        "total_bytes": total,
+        "bytes_per_row": round(total / max(1, len(df)), 1),
+        "columns": {str(col): int(size) for col, size in usage.items()}
+    }
+
+
+def write_table(df: pd.DataFrame, path: str):
+    """Write a comment table as Parquet, atomically"""
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    df.to_parquet(tmp_path, index=False, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+def read_table(path: str) -> pd.DataFrame:
+    """Comment table written by write_table, memory-mapped and back in the compact schema"""
+    return compact_frame(pd.read_parquet(path, memory_map=True))
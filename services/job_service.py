@@ -0,0 +1,194 @@
+import os, threading, time, uuid, traceback
+from concurrent.futures import ThreadPoolExecutor
+from config import ANALYSIS_WORKERS, MAX_QUEUED_JOBS, JOB_TTL_SECONDS, JOB_RESULT_CACHE_SECONDS
+from services import metrics
+
+_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis")
+_jobs: dict = {}
+# Latest job per dedupe key: requests for the same work attach to it while it runs
+_jobs_by_key: dict = {}
+_jobs_lock = threading.Lock()
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class Job:
+    """State, per-stage progress and result of one queued analysis"""
+
+    def __init__(self, params: dict, key=None):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.key = key
+        # Submissions this job answers, the first included
+        self.requests = 1
+        self.state = "queued"
+        self.stages = []
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        # Directory the job writes its outputs to, for the bytes each stage wrote
+        self.output_dir = None
+        # Bumped on every change so event streams can wait for the next one
+        self.version = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _touch(self):
+        # Callers hold self._lock
+        self.version += 1
+        self._changed.notify_all()
+
+    def set_state(self, state: str, **fields):
+        """Move the job to state, setting the given attributes along with it"""
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.state = state
+            self._touch()
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """Block until the job changes after version, or timeout passes; returns the current version"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def start_stage(self, name: str):
+        with self._lock:
+            self.stages.append({
+                "name": name,
+                "state": "running",
+                "started_at": time.time(),
+                "finished_at": None,
+                "outputs": [],
+                "error": None,
+                "_rss_before": metrics.rss_bytes()
+            })
+            self._touch()
+
+    def _bytes_written(self, outputs) -> int:
+        if not self.output_dir:
+            return 0
+        paths = (os.path.join(self.output_dir, fn) for fn in outputs)
+        return sum(os.path.getsize(p) for p in paths if os.path.isfile(p))
+
+    def finish_stage(self, name: str, outputs=None, error: str | None = None, **details):
+        """Close a running stage with its duration, rows processed (details["rows"]),
+        bytes written and resident memory change, and count it in the metrics.
+
+        details override the measured values, e.g. the seconds a stage took
+        on a worker process."""
+        outputs = list(outputs or [])
+        finished, rss, written = time.time(), metrics.rss_bytes(), self._bytes_written(outputs)
+        with self._lock:
+            for stage in reversed(self.stages):
+                if stage["name"] == name and stage["state"] == "running":
+                    stage["state"] = "failed" if error else "done"
+                    stage["finished_at"] = finished
+                    stage["outputs"] = outputs
+                    stage["error"] = error
+                    stage["seconds"] = round(finished - stage["started_at"], 3)
+                    stage["rows"] = 0
+                    stage["bytes_written"] = written
+                    stage["memory_delta_bytes"] = rss - stage.pop("_rss_before")
+                    stage.update(details)
+                    record = dict(stage)
+                    self._touch()
+                    break
+            else:
+                return
+        metrics.record_stage(record)
+
+    def update_progress(self, **values):
+        with self._lock:
+            self.progress.update(values)
+            self._touch()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed")
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            stages = [{k: v for k, v in s.items() if not k.startswith("_")} for s in self.stages]
+            progress = dict(self.progress)
+        done = sum(1 for s in stages if s["state"] != "running")
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "params": self.params,
+            "requests": self.requests,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "current_stage": next((s["name"] for s in reversed(stages) if s["state"] == "running"), None),
+            "stages_completed": done,
+            "stages": stages,
+            "progress": progress,
+            "error": self.error
+        }
+
+
+def _run(job: Job, fn):
+    job.set_state("running", started_at=time.time())
+    try:
+        job.set_state("done", result=fn(job), finished_at=time.time())
+    except Exception as e:
+        print(f"Job {job.id} failed: {e}")
+        traceback.print_exc()
+        job.set_state("failed", error=str(e), finished_at=time.time())
+    metrics.inc("sentica_jobs_total", state=job.state)
+
+
+def _prune_jobs():
+    cutoff = time.time() - JOB_TTL_SECONDS
+    for job_id, job in list(_jobs.items()):
+        if job.finished and job.finished_at < cutoff:
+            del _jobs[job_id]
+            if _jobs_by_key.get(job.key) is job:
+                del _jobs_by_key[job.key]
+
+
+def _reusable(job: Job | None) -> bool:
+    if job is None or job.state == "failed":
+        return False
+    return not job.finished or time.time() - job.finished_at < JOB_RESULT_CACHE_SECONDS
+
+
+def submit_job(fn, params: dict, key=None) -> tuple[Job, bool]:
+    """Queue fn(job) on the analysis worker pool; returns (job, whether it was reused).
+
+    With a key, a request matching a job that is still queued or running, or
+    that succeeded within JOB_RESULT_CACHE_SECONDS, gets that job instead of
+    a new run."""
+    with _jobs_lock:
+        _prune_jobs()
+        job = _jobs_by_key.get(key) if key is not None else None
+        if _reusable(job):
+            with job._lock:
+                job.requests += 1
+            metrics.inc("sentica_jobs_coalesced_total", source="cache" if job.finished else "in_flight")
+            return job, True
+        pending = sum(1 for j in _jobs.values() if not j.finished)
+        if pending >= MAX_QUEUED_JOBS:
+            raise QueueFullError(f"Too many pending analyses ({pending}), try again later")
+        job = Job(params, key)
+        _jobs[job.id] = job
+        if key is not None:
+            _jobs_by_key[key] = job
+    _executor.submit(_run, job, fn)
+    return job, False
+
+
+def pending_jobs() -> int:
+    with _jobs_lock:
+        return sum(1 for j in _jobs.values() if not j.finished)
+
+
+def get_job(job_id: str) -> Job | None:
+    with _jobs_lock:
+        return _jobs.get(job_id)
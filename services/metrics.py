@@ -0,0 +1,109 @@
+import os, sys, threading
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_histograms = {}
+
+HELP = {
+    "sentica_stage_runs_total": ("counter", "Pipeline stages finished, by stage and outcome"),
+    "sentica_stage_rows_total": ("counter", "Comments processed by pipeline stages"),
+    "sentica_stage_bytes_written_total": ("counter", "Bytes of output files written by pipeline stages"),
+    "sentica_stage_duration_seconds": ("histogram", "Wall time of pipeline stages"),
+    "sentica_stage_memory_delta_bytes": ("gauge", "Resident memory change over the last run of each stage"),
+    "sentica_youtube_pages_fetched_total": ("counter", "commentThreads pages fetched"),
+    "sentica_youtube_bytes_fetched_total": ("counter", "Bytes of commentThreads responses downloaded"),
+    "sentica_jobs_total": ("counter", "Analysis jobs finished, by outcome"),
+    "sentica_jobs_coalesced_total": ("counter", "Analysis requests answered by an existing job, by source"),
+    "sentica_jobs_pending": ("gauge", "Analysis jobs queued or running"),
+    "sentica_process_resident_memory_bytes": ("gauge", "Resident memory of this process"),
+}
+
+
+def rss_bytes() -> int:
+    """Current resident memory of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        # Windows has neither procfs nor resource
+        return 0
+    # No procfs (macOS): the peak is the closest figure available
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels):
+    with _lock:
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels):
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(name: str, value: float, **labels):
+    with _lock:
+        key = _key(name, labels)
+        counts, total, count = _histograms.get(key, ([0] * len(DURATION_BUCKETS), 0.0, 0))
+        counts = [c + (value <= bound) for c, bound in zip(counts, DURATION_BUCKETS)]
+        _histograms[key] = (counts, total + value, count + 1)
+
+
+def record_stage(stage: dict):
+    """Count one finished stage: a Job.stages entry, or a chart stage rendered on request"""
+    name = stage["name"]
+    inc("sentica_stage_runs_total", stage=name, state=stage["state"])
+    observe("sentica_stage_duration_seconds", stage["seconds"], stage=name)
+    if stage.get("rows"):
+        inc("sentica_stage_rows_total", stage["rows"], stage=name)
+    if stage.get("bytes_written"):
+        inc("sentica_stage_bytes_written_total", stage["bytes_written"], stage=name)
+    if stage.get("memory_delta_bytes") is not None:
+        set_gauge("sentica_stage_memory_delta_bytes", stage["memory_delta_bytes"], stage=name)
+    if name == "ingest":
+        inc("sentica_youtube_pages_fetched_total", stage.get("pages", 0))
+        inc("sentica_youtube_bytes_fetched_total", stage.get("bytes", 0))
+
+
+def _labels(labels: tuple, **extra) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    set_gauge("sentica_process_resident_memory_bytes", rss_bytes())
+    with _lock:
+        series = {}
+        for (name, labels), value in _counters.items():
+            series.setdefault(name, []).append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), value in _gauges.items():
+            series.setdefault(name, []).append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), (counts, total, count) in _histograms.items():
+            lines = series.setdefault(name, [])
+            lines += [f"{name}_bucket{_labels(labels, le=bound)} {c}" for bound, c in zip(DURATION_BUCKETS, counts)]
+            lines += [f"{name}_bucket{_labels(labels, le='+Inf')} {count}",
+                      f"{name}_sum{_labels(labels)} {round(total, 6)}",
+                      f"{name}_count{_labels(labels)} {count}"]
+    out = []
+    for name, (kind, text) in HELP.items():
+        if name in series:
+            out += [f"# HELP {name} {text}", f"# TYPE {name} {kind}", *series[name]]
+    return "\n".join(out) + "\n"
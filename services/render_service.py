@@ -0,0 +1,173 @@
+import os, json, threading, time
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pandas as pd
+from config import RENDER_WORKERS, POOL_START_METHOD
+from services.charts import CHART_STAGES, collect_figures, collected_figures
+from services.frame_schema import write_table, read_table
+from services import metrics
+
+# The run's comment table, which every chart and export is derived from, and
+# the (hidden) result of each stage rendered on demand.
+RUN_TABLE = "analysis.parquet"
+STAGE_RESULT = ".stage-{}.json"
+
+_pool = None
+_pool_lock = threading.Lock()
+_frame = (None, None)
+_run_locks = {}
+_run_locks_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor | None:
+    """Shared chart rendering pool, or None when RENDER_WORKERS disables it"""
+    global _pool
+    if RENDER_WORKERS <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS,
+                                        mp_context=multiprocessing.get_context(POOL_START_METHOD))
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor):
+    """Drop a pool whose worker died so the next run starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def render_stage(name: str, fn, df: pd.DataFrame, out_dir: str, message: str = "") -> dict:
+    """Run one chart stage; failures are captured instead of raised.
+
+    The stage's figures come back alongside its files so the PDF report can
+    place them as vector pages without decoding the PNGs again."""
+    if message:
+        print(message)
+    started = time.perf_counter()
+    collect_figures()
+    try:
+        outputs, error = fn(df, out_dir), None
+    except Exception as e:
+        print(f"Error in stage {name}: {e}")
+        outputs, error = [], str(e)
+    figures = [(filename, fig) for filename, fig in collected_figures() if filename in outputs]
+    return {"outputs": outputs, "error": error, "figures": figures,
+            "seconds": round(time.perf_counter() - started, 3)}
+
+
+def _render_from_file(name: str, fn, input_path: str, out_dir: str, message: str) -> dict:
+    # A worker keeps the last table it loaded, so stages of one run read it once
+    global _frame
+    if _frame[0] != input_path:
+        _frame = (input_path, load_run_table(input_path))
+    return render_stage(name, fn, _frame[1], out_dir, message)
+
+
+def save_run_table(df: pd.DataFrame, out_dir: str) -> str:
+    """Keep the run's comment table so its charts and exports can be derived later"""
+    path = os.path.join(out_dir, RUN_TABLE)
+    write_table(df, path)
+    return path
+
+
+def load_run_table(path: str) -> pd.DataFrame:
+    return read_table(path)
+
+
+def run_table_path(out_dir: str) -> str | None:
+    """Path of the comment table kept in a run directory, if any"""
+    path = os.path.join(out_dir, RUN_TABLE)
+    return path if os.path.exists(path) else None
+
+
+def run_lock(out_dir: str) -> threading.RLock:
+    """Lock serializing on-demand rendering within one run directory"""
+    with _run_locks_lock:
+        return _run_locks.setdefault(os.path.abspath(out_dir), threading.RLock())
+
+
+def render_on_demand(out_dir: str, name: str) -> dict:
+    """Render one chart stage of a finished run unless it already was.
+
+    Raises FileNotFoundError when the run kept no comment table (an eager or
+    pruned run). A stage already rendered returns its stored result, without
+    figures."""
+    result_path = os.path.join(out_dir, STAGE_RESULT.format(name))
+    with run_lock(out_dir):
+        if os.path.exists(result_path):
+            with open(result_path, encoding="utf8") as f:
+                return {**json.load(f), "figures": []}
+        input_path = run_table_path(out_dir)
+        if input_path is None:
+            raise FileNotFoundError(f"No comment table kept in {out_dir}")
+        message, fn = next((message, fn) for stage, message, fn in CHART_STAGES if stage == name)
+        pool = get_pool()
+        result = None
+        if pool is not None:
+            try:
+                result = pool.submit(_render_from_file, name, fn, input_path, out_dir, message).result()
+            except BrokenProcessPool:
+                _reset_pool(pool)
+        if result is None:
+            result = _render_from_file(name, fn, input_path, out_dir, message)
+        with open(result_path, "w", encoding="utf8") as f:
+            json.dump({k: result[k] for k in ("outputs", "error", "seconds")}, f)
+        metrics.record_stage({"name": name, "state": "failed" if result["error"] else "done",
+                              "seconds": result["seconds"]})
+        return result
+
+
+class RenderBatch:
+    """The chart stages of one run, rendering in the background.
+
+    With a pool every stage is submitted at once and the table is handed to
+    the workers through RUN_TABLE in the run directory (removed afterwards
+    unless the run already kept it); without one, stages render one by
+    one in the calling thread as results() is consumed."""
+
+    def __init__(self, stages, df: pd.DataFrame, out_dir: str):
+        self.stages = stages
+        self.names = [name for name, _, _ in stages]
+        self._df, self._out_dir = df, out_dir
+        self._input_path = None
+        self._futures = None
+        self._pool = get_pool()
+        if self._pool is not None:
+            input_path = os.path.join(out_dir, RUN_TABLE)
+            if not os.path.exists(input_path):
+                self._input_path = save_run_table(df, out_dir)
+            try:
+                self._futures = [self._pool.submit(_render_from_file, name, fn, input_path, out_dir, message)
+                                 for name, message, fn in stages]
+            except BrokenProcessPool:
+                _reset_pool(self._pool)
+                self._futures = None
+
+    def _result(self, future: Future) -> dict:
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            _reset_pool(self._pool)
+            return {"outputs": [], "error": f"Render worker died: {e}", "figures": [], "seconds": 0.0}
+        except Exception as e:
+            return {"outputs": [], "error": str(e), "figures": [], "seconds": 0.0}
+
+    def results(self):
+        """Yield (stage name, {"outputs", "error", "figures", "seconds"}) in stage order"""
+        try:
+            for i, (name, message, fn) in enumerate(self.stages):
+                if self._futures is None:
+                    yield name, render_stage(name, fn, self._df, self._out_dir, message)
+                else:
+                    yield name, self._result(self._futures[i])
+        finally:
+            if self._futures is not None:
+                for future in self._futures:
+                    future.cancel()
+            if self._input_path and os.path.exists(self._input_path):
+                os.remove(self._input_path)
@@ -0,0 +1,116 @@
+import os, json, sqlite3, threading, time
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response built from a cache row"""
+
+    def __init__(self, content: bytes, status_code: int = 200, from_cache: bool = True):
+        self.content = content
+        self.status_code = status_code
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """SQLite store of GET responses keyed by URL and query parameters.
+
+    Entries younger than ttl are served without touching the network. Older
+    entries are revalidated with If-None-Match, so an unchanged resource only
+    costs a 304. Rows not refreshed within max_age are dropped, and the least
+    recently used rows are evicted once the stored bodies exceed max_bytes."""
+
+    def __init__(self, path: str, ttl: float, max_age: float, max_bytes: int, ignored_params=("key",)):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.ignored_params = set(ignored_params)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            etag TEXT,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            accessed_at REAL NOT NULL)""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._db.commit()
+
+    def make_key(self, url: str, params: dict) -> str:
+        kept = sorted((k, str(v)) for k, v in params.items() if k not in self.ignored_params)
+        return url + "?" + "&".join(f"{k}={v}" for k, v in kept)
+
+    def _lookup(self, key: str):
+        with self._lock:
+            return self._db.execute(
+                "SELECT etag, body, fetched_at FROM responses WHERE key = ?", (key,)).fetchone()
+
+    def _touch(self, key: str, refreshed: bool):
+        now = time.time()
+        with self._lock:
+            if refreshed:
+                self._db.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    def _store(self, key: str, etag: str | None, body: bytes):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, body, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, etag, body, len(body), now, now))
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now: float):
+        self._db.execute("DELETE FROM responses WHERE fetched_at < ?", (now - self.max_age,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= target:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def get(self, session, url: str, params: dict, timeout: float, revalidate: bool = False):
+        """GET through the cache; returns a requests.Response or CachedResponse"""
+        key = self.make_key(url, params)
+        row = self._lookup(key)
+        headers = {}
+        if row:
+            etag, body, fetched_at = row
+            if not revalidate and time.time() - fetched_at < self.ttl:
+                self._touch(key, refreshed=False)
+                return CachedResponse(body)
+            if etag:
+                headers["If-None-Match"] = etag
+
+        r = session.get(url, params=params, headers=headers, timeout=timeout)
+        if r.status_code == 304 and row:
+            self._touch(key, refreshed=True)
+            return CachedResponse(row[1])
+        if r.status_code == 200:
+            etag = r.headers.get("ETag")
+            if not etag:
+                try:
+                    etag = r.json().get("etag")
+                except ValueError:
+                    etag = None
+            self._store(key, etag, r.content)
+        return r
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
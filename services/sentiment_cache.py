@@ -0,0 +1,125 @@
+import os, hashlib, sqlite3, threading
+from collections import OrderedDict
+
+# Part of every key; bumped when keys change so stores written under the
+# old scheme are never read. Version 2 keys on the exact text: case and
+# emoticons like ":D" change TextBlob's scores, so no folding is safe.
+KEY_VERSION = 2
+
+
+class CacheStats:
+    """Hit/miss counters for the lookups of one run or request"""
+
+    def __init__(self):
+        self.lookups = 0
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.batch_duplicates = 0
+        self.scored = 0
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> dict:
+        hits = self.memory_hits + self.store_hits + self.batch_duplicates
+        return {
+            "lookups": self.lookups,
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "batch_duplicates": self.batch_duplicates,
+            "scored": self.scored,
+            "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0
+        }
+
+
+class SentimentCache:
+    """Content-hash memo of (polarity, subjectivity) scores.
+
+    An in-process LRU answers repeats within and across runs; an optional
+    SQLite store keeps the scores across restarts. Keys include the scorer
+    name so different engines never share entries. Once the store holds more
+    than max_rows scores (0 for no limit) the oldest written are dropped,
+    down to 90% of it."""
+
+    def __init__(self, capacity: int, path: str | None = None, max_rows: int = 0):
+        self.capacity = capacity
+        self.max_rows = max_rows
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._rows = 0
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, polarity REAL, subjectivity REAL)")
+            self._rows = self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            self._prune()
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text: str, scorer: str) -> str:
+        return hashlib.sha1(f"{KEY_VERSION}\0{scorer}\0{text}".encode("utf8")).hexdigest()
+
+    def get_many(self, keys, stats: CacheStats | None = None) -> dict:
+        """Scores for the keys that are cached, from memory first and then the store"""
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+                else:
+                    missing.append(key)
+        memory_hits = len(found)
+        if missing and self._db is not None:
+            stored = {}
+            with self._lock:
+                for i in range(0, len(missing), 500):
+                    batch = missing[i:i + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, polarity, subjectivity FROM scores WHERE key IN ({','.join('?' * len(batch))})",
+                        batch).fetchall()
+                    stored.update((k, (p, s)) for k, p, s in rows)
+            self._remember(stored)
+            found.update(stored)
+        if stats is not None:
+            stats.add(memory_hits=memory_hits, store_hits=len(found) - memory_hits)
+        return found
+
+    def put_many(self, scores: dict):
+        self._remember(scores)
+        if self._db is not None and scores:
+            with self._lock:
+                self._db.executemany("INSERT OR REPLACE INTO scores (key, polarity, subjectivity) VALUES (?, ?, ?)",
+                                     [(k, float(p), float(s)) for k, (p, s) in scores.items()])
+                # Replaced keys are counted twice; _prune recounts before deleting anything
+                self._rows += len(scores)
+                self._prune()
+                self._db.commit()
+
+    def _prune(self):
+        if not self.max_rows or self._rows <= self.max_rows:
+            return
+        self._rows = self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        if self._rows <= self.max_rows:
+            return
+        # INSERT OR REPLACE gives a row a new rowid, so rowid order is write order
+        keep = max(int(self.max_rows * 0.9), 1)
+        self._db.execute("DELETE FROM scores WHERE rowid < (SELECT rowid FROM scores ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                         (keep - 1,))
+        self._rows = keep
+
+    def _remember(self, scores: dict):
+        with self._lock:
+            for key, value in scores.items():
+                self._lru[key] = value
+                self._lru.move_to_end(key)
+            while len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+
+    def __len__(self):
+        return len(self._lru)
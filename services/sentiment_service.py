@@ -1,18 +1,204 @@
+import threading
+import multiprocessing
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import textblob
 from textblob import TextBlob
+from config import (SENTIMENT_WORKERS, SENTIMENT_CHUNK_SIZE, POOL_START_METHOD,
+                    SENTIMENT_CACHE_SIZE, SENTIMENT_CACHE_PATH, SENTIMENT_CACHE_MAX_ROWS, SENTIMENT_SCORER)
+from services import lexicon_scorer
+from services.sentiment_cache import SentimentCache, CacheStats
 
-def analyze_sentiment(text: str):
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity  # -1 (negative) → +1 (positive)
+SCORER_NAME = f"textblob-{textblob.__version__}"
+# Engine choice -> versioned name used in cache keys and stored tables
+SCORERS = {"textblob": SCORER_NAME, "lexicon": lexicon_scorer.SCORER_NAME}
 
-    if polarity > 0:
-        sentiment = "Positive"
-    elif polarity < 0:
-        sentiment = "Negative"
+_pool = None
+_cache = None
+_pool_lock = threading.Lock()
+
+
+def score_text(text: str) -> tuple[float, float]:
+    """TextBlob polarity and subjectivity of one (cleaned) text"""
+    if not text or not text.strip():
+        return 0.0, 0.0
+    sentiment = TextBlob(text).sentiment
+    return sentiment.polarity, sentiment.subjectivity
+
+
+def label_scores(polarity: np.ndarray, threshold: float = 0.1) -> np.ndarray:
+    return np.where(polarity > threshold, "Positive", np.where(polarity < -threshold, "Negative", "Neutral")).astype(object)
+
+
+def _score_chunk(texts: list[str]) -> list[tuple[float, float]]:
+    return [score_text(t) for t in texts]
+
+
+def resolve_scorer(scorer: str | None) -> str:
+    """Validated engine name, falling back to SENTIMENT_SCORER"""
+    scorer = scorer or SENTIMENT_SCORER
+    if scorer not in SCORERS:
+        raise ValueError(f"Unknown scorer {scorer!r}, expected one of: {', '.join(SCORERS)}")
+    return scorer
+
+
+def get_pool() -> ProcessPoolExecutor | None:
+    """Shared scoring pool, or None when SENTIMENT_WORKERS disables it"""
+    global _pool
+    if SENTIMENT_WORKERS <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=SENTIMENT_WORKERS,
+                                        mp_context=multiprocessing.get_context(POOL_START_METHOD))
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor):
+    """Drop a pool whose worker died so the next batch starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def get_cache() -> SentimentCache | None:
+    global _cache
+    if SENTIMENT_CACHE_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _cache is None:
+            _cache = SentimentCache(SENTIMENT_CACHE_SIZE, SENTIMENT_CACHE_PATH or None, SENTIMENT_CACHE_MAX_ROWS)
+        return _cache
+
+
+def _lookup(texts: list[str], stats: CacheStats | None, scorer: str):
+    """Resolve cached scores; returns every text's key, the known scores and
+    the unique texts (with their keys) that still need scoring"""
+    keys = [SentimentCache.make_key(t, SCORERS[scorer]) for t in texts]
+    unique = dict(zip(keys, texts))
+    cache = get_cache()
+    known = cache.get_many(list(unique), stats) if cache is not None else {}
+    pending_keys = [k for k in unique if k not in known]
+    if stats is not None:
+        stats.add(lookups=len(texts), batch_duplicates=len(texts) - len(unique), scored=len(pending_keys))
+    return keys, known, pending_keys, [unique[k] for k in pending_keys]
+
+
+def _resolve(keys, known: dict, pending_keys, pending_pairs, threshold: float):
+    scored = dict(zip(pending_keys, (tuple(pair) for pair in pending_pairs)))
+    cache = get_cache()
+    if cache is not None:
+        cache.put_many(scored)
+    known.update(scored)
+    return _to_arrays([known[k] for k in keys], threshold)
+
+
+def _split(texts: list[str], chunk_size: int) -> list[list[str]]:
+    return [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+
+def _to_arrays(pairs, threshold: float):
+    scores = np.asarray(pairs, dtype=np.float64).reshape(-1, 2)
+    polarity, subjectivity = scores[:, 0], scores[:, 1]
+    return polarity, subjectivity, label_scores(polarity, threshold)
+
+
+def _clean_inputs(texts) -> list[str]:
+    return [t if isinstance(t, str) else "" for t in texts]
+
+
+def score_texts(texts, threshold: float = 0.1, chunk_size: int = SENTIMENT_CHUNK_SIZE,
+                stats: CacheStats | None = None, scorer: str | None = None):
+    """Score many texts, spreading uncached ones in chunks across the process pool.
+
+    Returns polarity, subjectivity and label arrays in input order. Repeated
+    texts are scored once; stats collects the cache hit counts. The lexicon
+    scorer handles a whole batch in one vectorized pass and skips the pool."""
+    scorer = resolve_scorer(scorer)
+    keys, known, pending_keys, pending = _lookup(_clean_inputs(texts), stats, scorer)
+    pool = get_pool()
+    if scorer == "lexicon":
+        pairs = lexicon_scorer.score_batch(pending)
+    elif pool is None or len(pending) <= chunk_size:
+        pairs = _score_chunk(pending)
     else:
-        sentiment = "Neutral"
+        try:
+            pairs = []
+            for chunk_pairs in pool.map(_score_chunk, _split(pending, chunk_size)):
+                pairs.extend(chunk_pairs)
+        except BrokenProcessPool:
+            print("Sentiment worker died, scoring this batch in process")
+            _reset_pool(pool)
+            pairs = _score_chunk(pending)
+    return _resolve(keys, known, pending_keys, pairs, threshold)
+
+
+class ScoringBatch:
+    """Scores of one submit_texts batch, its uncached texts spread in chunks across the pool.
+
+    done() polls without blocking. result() waits for the chunks, then writes
+    the cache and builds the arrays on the calling thread; if the pool broke,
+    or another batch's reset cancelled these chunks, the batch is scored in
+    process instead."""
+
+    def __init__(self, keys, known: dict, pending_keys, pending: list[str], threshold: float, score=_score_chunk):
+        self._keys, self._known, self._pending_keys, self._pending = keys, known, pending_keys, pending
+        self._threshold, self._score = threshold, score
+        self._pool, self._futures = None, []
+        self._arrays = None
+
+    def submit(self, pool: ProcessPoolExecutor, chunk_size: int):
+        try:
+            self._futures = [pool.submit(_score_chunk, chunk) for chunk in _split(self._pending, chunk_size)]
+            self._pool = pool
+        except BrokenProcessPool:
+            print("Sentiment worker died, scoring this batch in process")
+            _reset_pool(pool)
+
+    def done(self) -> bool:
+        return self._arrays is not None or all(f.done() for f in self._futures)
+
+    def result(self):
+        """polarity, subjectivity and label arrays in input order, as score_texts returns them"""
+        if self._arrays is None:
+            try:
+                pairs = [pair for f in self._futures for pair in f.result()] if self._futures \
+                    else self._score(self._pending)
+            except (BrokenProcessPool, CancelledError):
+                print("Sentiment pool broke or was reset, scoring this batch in process")
+                _reset_pool(self._pool)
+                pairs = self._score(self._pending)
+            self._arrays = _resolve(self._keys, self._known, self._pending_keys, pairs, self._threshold)
+        return self._arrays
+
+
+def submit_texts(texts, threshold: float = 0.1, chunk_size: int = SENTIMENT_CHUNK_SIZE,
+                 stats: CacheStats | None = None, scorer: str | None = None) -> ScoringBatch:
+    """Non-blocking score_texts: the batch's result() returns the same three arrays.
+
+    Lets a caller keep fetching and preprocessing while earlier batches are
+    still being scored on other cores."""
+    scorer = resolve_scorer(scorer)
+    keys, known, pending_keys, pending = _lookup(_clean_inputs(texts), stats, scorer)
+    if scorer == "lexicon":
+        # One vectorized pass when the caller collects it; not worth a trip to the pool
+        return ScoringBatch(keys, known, pending_keys, pending, threshold, lexicon_scorer.score_batch)
+    batch = ScoringBatch(keys, known, pending_keys, pending, threshold)
+    pool = get_pool()
+    if pool is not None and pending:
+        batch.submit(pool, chunk_size)
+    return batch
+
+
+def analyze_sentiment(text: str, scorer: str | None = None):
+    polarity, _, labels = score_texts([text], threshold=0.0, scorer=scorer)
+    polarity = float(polarity[0])  # -1 (negative) → +1 (positive)
 
     return {
         "text": text,
-        "sentiment": sentiment,
+        "sentiment": labels[0],
         "polarity": round(polarity, 2)
     }
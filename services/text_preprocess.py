@@ -0,0 +1,76 @@
+import re
+import pandas as pd
+import emoji
+
+# clean_text's four substitutions fused into one pass: URLs, then @mentions
+# and #hashtags, then any other character that is not a letter, digit or
+# whitespace. A lone "@" or "#" falls through to the last alternative.
+STRIP_RE = re.compile(r"http\S+|[@#]\S+|[^A-Za-z0-9\s@#]+|[@#]")
+
+
+def clean_text(t: str) -> str:
+    return " ".join(STRIP_RE.sub("", t).split())
+
+
+def clean_texts(texts: pd.Series) -> pd.Series:
+    """clean_text over a whole column without a Python call per row"""
+    return pd.Series([" ".join(STRIP_RE.sub("", t).split()) for t in texts.tolist()],
+                     index=texts.index, dtype=object)
+
+
+def _emoji_run_re() -> re.Pattern:
+    # Any run of characters that occur in emoji sequences, optionally led by
+    # the ASCII base of a keycap ("1️⃣"); runs are split into emoji below
+    codepoints = sorted({ord(c) for e in emoji.EMOJI_DATA for c in e if ord(c) > 127})
+    ranges = []
+    for cp in codepoints:
+        if ranges and ranges[-1][1] + 1 == cp:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    chars = "".join(re.escape(chr(a)) if a == b else f"{re.escape(chr(a))}-{re.escape(chr(b))}" for a, b in ranges)
+    return re.compile(f"[#*0-9]?[{chars}]+")
+
+
+EMOJI_RUN_RE = _emoji_run_re()
+NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+# Every multi-codepoint emoji contains one of these: ZWJ, presentation
+# selector, keycap, skin tone, regional indicator (flags) or tag characters
+COMBINER_RE = re.compile("[\u200d\ufe0f\u20e3\U0001F3FB-\U0001F3FF\U0001F1E6-\U0001F1FF\U000E0020-\U000E007F]")
+MAX_EMOJI_LEN = max(map(len, emoji.EMOJI_DATA))
+# "❤️" and "❤" are counted as one emoji: the presentation selector is dropped
+# whenever the bare sequence is an emoji of its own
+CANONICAL_EMOJI = {e: e.replace("\ufe0f", "") for e in emoji.EMOJI_DATA
+                   if "\ufe0f" in e and e.replace("\ufe0f", "") in emoji.EMOJI_DATA}
+
+
+def _split_run(run: str) -> list:
+    if run in emoji.EMOJI_DATA:
+        return [CANONICAL_EMOJI.get(run, run)]
+    if not COMBINER_RE.search(run):
+        return [c for c in run if c in emoji.EMOJI_DATA]
+    found, i = [], 0
+    while i < len(run):
+        # Longest emoji starting here, so flags, skin tones and ZWJ families stay whole
+        for size in range(min(MAX_EMOJI_LEN, len(run) - i), 0, -1):
+            candidate = run[i:i + size]
+            if candidate in emoji.EMOJI_DATA:
+                found.append(CANONICAL_EMOJI.get(candidate, candidate))
+                i += size
+                break
+        else:
+            i += 1
+    return found
+
+
+def extract_emojis(text: str) -> list:
+    """Emoji of a text in order, multi-codepoint sequences kept whole"""
+    if text.isascii():
+        return []
+    if not COMBINER_RE.search(text):
+        return [c for c in NON_ASCII_RE.findall(text) if c in emoji.EMOJI_DATA]
+    return [e for run in EMOJI_RUN_RE.findall(text) for e in _split_run(run)]
+
+
+def extract_emoji_lists(texts: pd.Series) -> pd.Series:
+    return pd.Series([extract_emojis(t) for t in texts.tolist()], index=texts.index, dtype=object)
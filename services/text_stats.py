@@ -0,0 +1,74 @@
+import threading, weakref
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+# Whitespace-separated, case-preserving tokens: the words str.split() yields
+TOKEN_PATTERN = r"\S+"
+
+_cache = (None, None)
+_cache_lock = threading.Lock()
+
+
+class TermCounts:
+    """Word and bigram counts of a column of texts from one tokenization pass.
+
+    A single CountVectorizer over unigrams and bigrams gives a sparse
+    document-term matrix; its columns are split into words and bigrams
+    (bigram features are the ones containing a space). Frequencies for any
+    subset of documents are then column sums over the selected rows."""
+
+    def __init__(self, texts):
+        vectorizer = CountVectorizer(token_pattern=TOKEN_PATTERN, lowercase=False, ngram_range=(1, 2))
+        try:
+            matrix = vectorizer.fit_transform(texts)
+            terms = vectorizer.get_feature_names_out()
+        except ValueError:  # no document has a single token
+            matrix, terms = None, np.array([], dtype=object)
+        is_bigram = np.char.find(terms.astype(str), " ") >= 0
+        self.words, self.bigrams = terms[~is_bigram], terms[is_bigram]
+        self.word_matrix = matrix[:, np.flatnonzero(~is_bigram)].tocsr() if matrix is not None else None
+        self.bigram_matrix = matrix[:, np.flatnonzero(is_bigram)].tocsr() if matrix is not None else None
+
+    def frequencies(self, kind: str = "words", rows=None) -> pd.Series:
+        """Counts of every word (or bigram) in the selected rows, most frequent first.
+
+        rows is a boolean mask or index array over the documents; ties keep
+        vocabulary order."""
+        terms, matrix = (self.words, self.word_matrix) if kind == "words" else (self.bigrams, self.bigram_matrix)
+        if matrix is None:
+            return pd.Series([], dtype=np.int64)
+        if rows is not None:
+            matrix = matrix[np.asarray(rows)]
+        counts = np.asarray(matrix.sum(axis=0)).ravel()
+        keep = np.flatnonzero(counts)
+        order = keep[np.argsort(-counts[keep], kind="stable")]
+        return pd.Series(counts[order], index=terms[order])
+
+    def first_seen(self, kind: str = "words", rows=None) -> pd.Series:
+        """Position of the first selected document containing each term that occurs there"""
+        terms, matrix = (self.words, self.word_matrix) if kind == "words" else (self.bigrams, self.bigram_matrix)
+        if matrix is None:
+            return pd.Series([], dtype=np.int64)
+        if rows is not None:
+            matrix = matrix[np.asarray(rows)]
+        matrix = matrix.tocsc()
+        matrix.sort_indices()
+        present = np.flatnonzero(np.diff(matrix.indptr))
+        return pd.Series(matrix.indices[matrix.indptr[present]], index=terms[present])
+
+    def most_common(self, n: int, kind: str = "words", rows=None) -> list[tuple[str, int]]:
+        freq = self.frequencies(kind, rows).head(n)
+        return list(zip(freq.index.tolist(), freq.tolist()))
+
+
+def term_counts(df: pd.DataFrame) -> TermCounts:
+    """TermCounts of df["cleaned"], shared by every stage working on the same frame"""
+    global _cache
+    with _cache_lock:
+        ref, counts = _cache
+        if ref is not None and ref() is df:
+            return counts
+        counts = TermCounts(df["cleaned"].fillna("").astype(str))
+        _cache = (weakref.ref(df), counts)
+        return counts
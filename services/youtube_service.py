@@ -0,0 +1,205 @@
+import queue, threading, time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import (YOUTUBE_API_KEY, YOUTUBE_API_BASE, YOUTUBE_POOL_SIZE, FETCH_PREFETCH_PAGES, API_CACHE_PATH,
+                    API_CACHE_TTL_SECONDS, API_CACHE_MAX_AGE_SECONDS, API_CACHE_MAX_MB)
+from services.response_cache import ResponseCache
+
+EMPTY_VIDEO_INFO = {"title": "", "channel": "", "published_at": "", "view_count": "0", "like_count": "0", "comment_count": "0"}
+
+_session = None
+_cache = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Shared keep-alive session; every fetch reuses its pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=("GET",), raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=YOUTUBE_POOL_SIZE, pool_maxsize=YOUTUBE_POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_response_cache() -> ResponseCache | None:
+    global _cache
+    if not API_CACHE_PATH:
+        return None
+    with _session_lock:
+        if _cache is None:
+            _cache = ResponseCache(API_CACHE_PATH, ttl=API_CACHE_TTL_SECONDS, max_age=API_CACHE_MAX_AGE_SECONDS,
+                                   max_bytes=API_CACHE_MAX_MB * 1024 * 1024)
+        return _cache
+
+
+def api_get(endpoint: str, params: dict, timeout: float, revalidate: bool = False):
+    """GET a YouTube Data API endpoint through the response cache when enabled"""
+    url = f"{YOUTUBE_API_BASE}/{endpoint}"
+    cache = get_response_cache()
+    if cache:
+        return cache.get(get_session(), url, params, timeout, revalidate=revalidate)
+    return get_session().get(url, params=params, timeout=timeout)
+
+
+class FetchStats:
+    """Throughput counters for one comment fetch"""
+
+    def __init__(self):
+        self.pages = 0
+        self.comments = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def to_dict(self) -> dict:
+        elapsed = max(self.elapsed, 1e-9)
+        return {
+            "pages": self.pages,
+            "comments": self.comments,
+            "bytes": self.bytes,
+            "cache_hits": self.cache_hits,
+            "elapsed_seconds": round(elapsed, 3),
+            "pages_per_second": round(self.pages / elapsed, 2),
+            "comments_per_second": round(self.comments / elapsed, 2)
+        }
+
+
+def fetch_video_info(video_id: str) -> dict:
+    if not YOUTUBE_API_KEY:
+        return dict(EMPTY_VIDEO_INFO)
+    try:
+        r = api_get("videos", {"part": "snippet,statistics", "id": video_id, "key": YOUTUBE_API_KEY}, timeout=20)
+        if r.status_code == 200:
+            data = r.json()
+            if data.get("items"):
+                sn = data["items"][0]["snippet"]
+                st = data["items"][0]["statistics"]
+                return {
+                    "title": sn.get("title", ""),
+                    "channel": sn.get("channelTitle", ""),
+                    "published_at": sn.get("publishedAt", ""),
+                    "view_count": st.get("viewCount", "0"),
+                    "like_count": st.get("likeCount", "0"),
+                    "comment_count": st.get("commentCount", "0")
+                }
+    except Exception as e:
+        print("Error fetching info:", e)
+    return dict(EMPTY_VIDEO_INFO)
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce_pages(video_id: str, q: queue.Queue, stop: threading.Event, stats: FetchStats,
+                   order: str, revalidate: bool):
+    """Download commentThreads pages ahead of the consumer.
+
+    Pages are chained by nextPageToken, so downloads are inherently serial;
+    running them on their own thread overlaps each round trip with the
+    processing of the previous page."""
+    token = None
+    try:
+        while not stop.is_set():
+            params = {
+                "part": "snippet",
+                "videoId": video_id,
+                "key": YOUTUBE_API_KEY,
+                "maxResults": 100,
+                "order": order
+            }
+            if token:
+                params["pageToken"] = token
+
+            r = api_get("commentThreads", params, timeout=30, revalidate=revalidate)
+            if r.status_code != 200:
+                raise RuntimeError(f"YouTube API error: {r.status_code} - {r.text}")
+
+            data = r.json()
+            if getattr(r, "from_cache", False):
+                stats.cache_hits += 1
+            else:
+                stats.bytes += len(r.content)
+            token = data.get("nextPageToken")
+            if not _put(q, data.get("items", []), stop) or not token:
+                break
+    except Exception as e:
+        _put(q, e, stop)
+    finally:
+        _put(q, None, stop)
+
+
+def iter_comment_pages(video_id: str, stats: FetchStats | None = None, order: str = "relevance",
+                       revalidate: bool = False):
+    """Yield the comments of a video one API page at a time.
+
+    A producer thread keeps up to FETCH_PREFETCH_PAGES raw pages queued while
+    the caller works on the current one. Closing the generator early stops the
+    producer. revalidate bypasses fresh cache entries, which callers polling
+    for new comments need."""
+    if not YOUTUBE_API_KEY:
+        raise RuntimeError("YOUTUBE_API_KEY is not set")
+
+    stats = stats or FetchStats()
+    q, stop = queue.Queue(maxsize=FETCH_PREFETCH_PAGES), threading.Event()
+    producer = threading.Thread(target=_produce_pages, args=(video_id, q, stop, stats, order, revalidate),
+                                name=f"fetch-{video_id}", daemon=True)
+    producer.start()
+    try:
+        while True:
+            items = q.get()
+            if items is None:
+                break
+            if isinstance(items, Exception):
+                raise items
+
+            page = []
+            for it in items:
+                top = it["snippet"]["topLevelComment"]
+                sn = top["snippet"]
+                page.append({
+                    "author": sn.get("authorDisplayName", ""),
+                    "text": sn.get("textDisplay", "") or "",
+                    "likes": sn.get("likeCount", 0),
+                    "published_at": sn.get("publishedAt", ""),
+                    "comment_id": top.get("id") or it.get("id", ""),
+                    "updated_at": sn.get("updatedAt", "")
+                })
+            stats.pages += 1
+            stats.comments += len(page)
+            yield page
+    finally:
+        stop.set()
+        stats.finished = time.perf_counter()
+
+
+def fetch_comments(video_id: str, stats: FetchStats | None = None) -> list[dict]:
+    """Fetch ALL comments with no limit"""
+    stats = stats or FetchStats()
+    comments = []
+    print(f"Starting to fetch ALL comments for video {video_id}...")
+
+    for page in iter_comment_pages(video_id, stats):
+        comments.extend(page)
+        print(f"Fetched {stats.comments} comments so far ({stats.to_dict()['pages_per_second']} pages/s)...")
+
+    print(f"Completed fetching {stats.comments} total comments: {stats.to_dict()}")
+    return comments
@@ -0,0 +1,84 @@
+import io, os, threading, zipfile
+import pytest
+from services import archive_service
+from services.archive_service import get_archive, build_archive, ARCHIVE_NAME
+
+
+@pytest.fixture
+def run_dir(tmp_path):
+    files = {
+        "chart.png": os.urandom(3 * 2**20),
+        "report.pdf": os.urandom(2**20),
+        "analysis.csv": b"author,text,likes\n" + b"someone,great video,3\n" * 50000,
+        "summary.txt": b"Total comments: 50000\n",
+    }
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+    (tmp_path / ".stage-wordclouds.json").write_text("{}")
+    return str(tmp_path), files
+
+
+@pytest.fixture
+def paused_build(monkeypatch):
+    """Holds the archive writer once 1 MiB is written, until the returned event is set"""
+    release = threading.Event()
+    write = archive_service._AppendOnlyFile.write
+
+    def slow_write(self, data):
+        if self.tell() > 2**20:
+            assert release.wait(10)
+        return write(self, data)
+
+    monkeypatch.setattr(archive_service._AppendOnlyFile, "write", slow_write)
+    return release
+
+
+def check_archive(data: bytes, files: dict):
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert sorted(zf.namelist()) == sorted(files)
+        for name, content in files.items():
+            assert zf.read(name) == content
+
+
+def test_streams_are_valid_while_another_download_is_in_progress(run_dir, paused_build):
+    out_dir, files = run_dir
+    build = get_archive(out_dir)
+    first = build.stream()
+    head = next(first)
+    assert not build.done
+
+    # A second download joins the same build and completes while the first is still open
+    assert get_archive(out_dir) is build
+    second = build.stream()
+    second_head = next(second)
+    paused_build.set()
+    second = second_head + b"".join(second)
+    assert build.done and build.error is None
+    check_archive(second, files)
+
+    # The first download still reads the same bytes from its open handle
+    check_archive(head + b"".join(first), files)
+
+    # Later downloads are served from the finished outputs.zip
+    assert get_archive(out_dir) is None
+    with open(os.path.join(out_dir, ARCHIVE_NAME), "rb") as f:
+        assert f.read() == second
+    assert not [name for name in os.listdir(out_dir) if name.endswith(".partial")]
+
+
+def test_archive_is_rebuilt_when_run_files_change(run_dir):
+    out_dir, files = run_dir
+    assert build_archive(out_dir) == ARCHIVE_NAME
+    assert get_archive(out_dir) is None
+
+    files["summary.txt"] = b"Total comments: 50001\n"
+    with open(os.path.join(out_dir, "summary.txt"), "wb") as f:
+        f.write(files["summary.txt"])
+    build = get_archive(out_dir)
+    assert build is not None
+    check_archive(b"".join(build.stream()), files)
+    with zipfile.ZipFile(os.path.join(out_dir, ARCHIVE_NAME)) as zf:
+        assert zf.read("summary.txt") == files["summary.txt"]
+        assert zf.getinfo("chart.png").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("analysis.csv").compress_type == zipfile.ZIP_DEFLATED
@@ -0,0 +1,29 @@
+import os
+import pandas as pd
+import pytest
+from wordcloud import WordCloud, STOPWORDS
+from services.charts import cloud_frequencies
+from services.text_stats import TermCounts
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs", "analysis.csv")
+
+
+def baseline_frequencies(texts) -> dict:
+    # What save_wordclouds laid out before the shared term counts: WordCloud.generate's own counting
+    words = WordCloud(stopwords=set(STOPWORDS), collocations=False).process_text(" ".join(texts))
+    return {w: c for w, c in words.items() if len(w) > 1}
+
+
+@pytest.mark.parametrize("sentiment", [None, "Positive", "Negative", "Neutral"])
+def test_cloud_frequencies_match_wordcloud(sentiment):
+    sample = pd.read_csv(SAMPLE_CSV)
+    texts = sample["cleaned"].fillna("").astype(str)
+    rows = None if sentiment is None else (sample["sentiment"] == sentiment).to_numpy()
+    selected = texts if rows is None else texts[rows]
+
+    assert cloud_frequencies(TermCounts(texts), rows) == baseline_frequencies(selected)
+
+
+def test_cloud_frequencies_fold_case_and_plurals():
+    counts = TermCounts(["PMGC pmgc PMGC", "Team teams", "class classes", "us u", "2024 99"])
+    assert cloud_frequencies(counts) == {"PMGC": 3, "Team": 2, "class": 1, "classes": 1}
@@ -0,0 +1,53 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import app
+from services import sentiment_service
+from services.frame_schema import compact_frame, write_table, read_table, emoji_lists, SENTIMENTS
+from services.sentiment_cache import SentimentCache
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs", "analysis.csv")
+
+
+@pytest.fixture
+def comments(monkeypatch) -> pd.DataFrame:
+    """Sample comments through preprocessing and scoring, in the loose schema the pipeline builds"""
+    monkeypatch.setattr(sentiment_service, "_cache", SentimentCache(1000))
+    sample = pd.read_csv(SAMPLE_CSV).head(300)
+    raw = pd.DataFrame({"comment_id": [f"c{i}" for i in range(len(sample))], "author": sample["author"],
+                        "text": sample["text"].astype(str), "likes": sample["likes"],
+                        "published_at": sample["published_at"].str.replace(" ", "T") + "Z"})
+    # One comment mixing plain, skin-toned and presentation-selector emoji
+    raw.loc[0, "text"] = "nice 👍🏽 ❤️ 😀😀"
+    return app.process_comments(raw, scorer="lexicon")
+
+
+def test_compact_table_round_trips_through_parquet(comments, tmp_path):
+    loose = comments.copy()
+    compact = compact_frame(comments.copy())
+    compact.attrs["scorer"] = "lexicon-test"
+    path = str(tmp_path / "analysis.parquet")
+    write_table(compact, path)
+    restored = read_table(path)
+
+    pd.testing.assert_frame_equal(restored, compact)
+    assert restored.attrs["scorer"] == "lexicon-test"
+    assert list(restored["sentiment"].cat.categories) == SENTIMENTS
+    assert restored["hour"].dtype == np.int8 and restored["polarity"].dtype == np.float32
+    assert not [f for f in os.listdir(tmp_path) if f.endswith(".tmp")]
+
+    # Nothing the exports show is lost to the narrower schema
+    assert emoji_lists(restored["emojis"]) == emoji_lists(loose["emojis"])
+    assert emoji_lists(restored["emojis"])[0] == ["👍🏽", "❤", "😀", "😀"]
+    assert restored["sentiment"].astype(str).tolist() == loose["sentiment"].tolist()
+    assert restored["author"].astype(str).tolist() == loose["author"].astype(str).tolist()
+    np.testing.assert_allclose(restored["polarity"], loose["polarity"], atol=1e-6)
+    for col in ("likes", "length", "hour", "day_of_week", "month"):
+        assert restored[col].tolist() == loose[col].tolist()
+    pd.testing.assert_series_equal(restored["datetime"], loose["datetime"])
+
+
+def test_compacting_twice_changes_nothing(comments):
+    compact = compact_frame(comments)
+    pd.testing.assert_frame_equal(compact_frame(compact.copy()), compact)
@@ -0,0 +1,47 @@
+import time
+import pandas as pd
+from services.analysis_store import new_comments, merge_comment_tables, is_stale, FULL_FETCH_ATTR
+
+
+def comment(comment_id, updated_at, text):
+    return {"comment_id": comment_id, "updated_at": updated_at, "text": text}
+
+
+def test_delta_stops_at_first_known_comment_and_replaces_edits():
+    stored = pd.DataFrame([comment("c3", "t3", "third"), comment("c2", "t2", "second"), comment("c1", "t1", "first")])
+    known = dict(zip(stored["comment_id"], stored["updated_at"]))
+    pages = [
+        # Newest first: a new comment, an edit of c3, then c2 unchanged
+        [comment("c4", "t4", "fourth"), comment("c3", "t3b", "third, edited"), comment("c2", "t2", "second")],
+        # Never reached: an edit below the first unchanged comment is only seen by a full fetch
+        [comment("c1", "t1b", "first, edited")],
+    ]
+    fetched = []
+
+    def iter_pages():
+        for page in pages:
+            fetched.append(page)
+            yield page
+
+    batches = list(new_comments(iter_pages(), known))
+    assert batches == [[comment("c4", "t4", "fourth"), comment("c3", "t3b", "third, edited")]]
+    assert len(fetched) == 1
+
+    merged = merge_comment_tables(pd.DataFrame(batches[0]), stored)
+    assert merged["comment_id"].tolist() == ["c4", "c3", "c2", "c1"]
+    assert merged["text"].tolist() == ["fourth", "third, edited", "second", "first"]
+
+
+def test_pages_without_known_comments_are_all_fetched():
+    known = {"old": "t0"}
+    pages = [[comment("a", "t1", "")], [comment("b", "t1", "")], [comment("old", "t0", ""), comment("c", "t1", "")],
+             [comment("d", "t1", "")]]
+    assert list(new_comments(iter(pages), known)) == [*pages[:2], [comment("c", "t1", "")]]
+
+
+def test_tables_not_fetched_in_full_recently_are_stale():
+    fresh, old, unknown = pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+    fresh.attrs[FULL_FETCH_ATTR] = time.time() - 3600
+    old.attrs[FULL_FETCH_ATTR] = time.time() - 3 * 3600
+    assert not is_stale(fresh, 2) and is_stale(old, 2) and is_stale(unknown, 2)
+    assert not is_stale(old, 0)
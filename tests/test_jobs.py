@@ -0,0 +1,128 @@
+import json, threading, http.client
+import pytest
+from flask import Flask
+from werkzeug.serving import make_server
+import routes.jobs
+from routes.jobs import jobs_bp
+from services.job_service import submit_job, get_job
+
+
+@pytest.fixture
+def server():
+    app = Flask(__name__)
+    app.register_blueprint(jobs_bp)
+    # Threaded like the gthread workers in the Procfile
+    httpd = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_port
+    httpd.shutdown()
+
+
+def blocked_job():
+    started, release = threading.Event(), threading.Event()
+
+    def run(job):
+        job.start_stage("ingest")
+        started.set()
+        release.wait(10)
+        job.finish_stage("ingest")
+        return {"total_comments": 3}
+
+    job, _ = submit_job(run, {"video_id": "test"})
+    assert started.wait(5)
+    return job, release
+
+
+def read_events(response) -> list[tuple[str, dict]]:
+    events, name = [], None
+    for raw in response:
+        line = raw.decode().rstrip("\n")
+        if line.startswith("event: "):
+            name = line[7:]
+        elif line.startswith("data: "):
+            events.append((name, json.loads(line[6:])))
+            if name in ("done", "failed"):
+                break
+    return events
+
+
+def get(port, path, headers=None, timeout=5):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    conn.request("GET", path, headers=headers or {})
+    return conn.getresponse()
+
+
+def test_other_requests_are_served_while_events_stream(server):
+    job, release = blocked_job()
+    stream = get(server, f"/jobs/{job.id}/events")
+    assert stream.status == 200
+    assert stream.readline().startswith(b"retry: ")
+
+    status = get(server, f"/jobs/{job.id}", timeout=2)
+    assert status.status == 200
+    assert json.loads(status.read())["state"] == "running"
+
+    release.set()
+    events = read_events(stream)
+    assert events[-1][0] == "done"
+    assert events[-1][1]["total_comments"] == 3
+    assert any(name == "stage" and data["state"] == "done" for name, data in events)
+
+
+def test_stream_is_bounded_and_resumes_from_last_event_id(server, monkeypatch):
+    monkeypatch.setattr(routes.jobs, "EVENTS_STREAM_SECONDS", 0.3)
+    job, release = blocked_job()
+    try:
+        first = get(server, f"/jobs/{job.id}/events")
+        body = first.read().decode()
+        assert "event: snapshot" in body
+
+        version = job.version
+        resumed = get(server, f"/jobs/{job.id}/events", headers={"Last-Event-ID": str(version)})
+        assert "event: snapshot" not in resumed.read().decode()
+    finally:
+        release.set()
+
+
+def test_concurrent_analyses_of_a_video_share_one_job(monkeypatch):
+    import app
+    release = threading.Event()
+    runs = []
+
+    def run_analysis(job):
+        runs.append(job.params)
+        release.wait(10)
+        return {"message": "done"}
+
+    monkeypatch.setattr(app, "run_analysis", run_analysis)
+    client = app.app.test_client()
+    url = "https://www.youtube.com/watch?v=coalesce001"
+    barrier = threading.Barrier(4)
+    responses = []
+
+    def post(body):
+        barrier.wait()
+        responses.append(client.post("/analyze_video", json=body).get_json())
+
+    try:
+        threads = [threading.Thread(target=post, args=({"video_url": url, "scorer": "textblob"},)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({r["job_id"] for r in responses}) == 1
+        assert sorted(r["reused"] for r in responses) == [False, True, True, True]
+
+        refreshed = client.post("/analyze_video", json={"video_url": url, "scorer": "textblob",
+                                                        "full_refresh": True}).get_json()
+        other_scorer = client.post("/analyze_video", json={"video_url": url, "scorer": "lexicon"}).get_json()
+        job_ids = {responses[0]["job_id"], refreshed["job_id"], other_scorer["job_id"]}
+        assert len(job_ids) == 3
+        assert not refreshed["reused"] and not other_scorer["reused"]
+    finally:
+        release.set()
+    for job_id in job_ids:
+        job = get_job(job_id)
+        while not job.finished:
+            job.wait_for_change(job.version, 1)
+    assert len(runs) == 3
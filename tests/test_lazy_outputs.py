@@ -0,0 +1,82 @@
+import os, json, itertools
+import pandas as pd
+import pytest
+import app
+from services import analysis_store, render_service, sentiment_service
+from services.charts import STAGE_FILES, CHART_FILES
+from services.job_service import get_job
+from services.render_service import render_on_demand, STAGE_RESULT
+from services.sentiment_cache import SentimentCache
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs", "analysis.csv")
+# Each run gets its own video id so finished jobs are never reused across tests
+VIDEO_IDS = (f"lazyrun{i:04d}" for i in itertools.count())
+
+
+@pytest.fixture
+def lazy_run(tmp_path, monkeypatch):
+    """A finished lazy analysis of 300 sample comments: (client, outputs path, run dir, result)"""
+    sample = pd.read_csv(SAMPLE_CSV).head(300)
+    comments = [{"comment_id": f"c{i}", "updated_at": "u", "author": r.author, "text": r.text, "likes": r.likes,
+                 "published_at": r.published_at.replace(" ", "T") + "Z"} for i, r in enumerate(sample.itertuples())]
+
+    def pages(vid, stats=None, order="relevance", revalidate=False):
+        for i in range(0, len(comments), 100):
+            yield comments[i:i + 100]
+
+    monkeypatch.setattr(app, "iter_comment_pages", pages)
+    monkeypatch.setattr(app, "fetch_video_info", lambda vid: {"title": "Sample", "channel": "Channel"})
+    monkeypatch.setattr(app, "OUTPUT_DIR", str(tmp_path / "outputs"))
+    monkeypatch.setattr(app, "CHART_RENDERING", "lazy")
+    monkeypatch.setattr(analysis_store, "STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.setattr(render_service, "RENDER_WORKERS", 0)
+    monkeypatch.setattr(sentiment_service, "SENTIMENT_WORKERS", 0)
+    monkeypatch.setattr(sentiment_service, "_cache", SentimentCache(1000))
+
+    client = app.app.test_client()
+    url = f"https://www.youtube.com/watch?v={next(VIDEO_IDS)}"
+    started = client.post("/analyze_video", json={"video_url": url}).get_json()
+    job = get_job(started["job_id"])
+    while not job.finished:
+        job.wait_for_change(job.version, 1)
+    result = client.get(f"/jobs/{job.id}/result").get_json()
+    assert result["state"] == "done", result
+    path = result["outputs_path"]
+    return client, path, os.path.join(app.OUTPUT_DIR, *path.split("/")[2:]), result
+
+
+def test_lazy_run_lists_unrendered_charts_as_pending(lazy_run):
+    client, path, out_dir, result = lazy_run
+    assert sorted(result["pending_outputs"]) == sorted(CHART_FILES)
+    listing = client.get(f"{path}/list").get_json()
+    assert listing["pending"] == sorted(CHART_FILES)
+    assert not set(listing["files"]) & set(CHART_FILES)
+    assert {"report.pdf", "outputs.zip", "analysis.csv"} <= set(listing["files"])
+
+    # Requesting one chart renders its whole stage, which then leaves the pending list
+    assert client.get(f"{path}/file/hourly_distribution.png").status_code == 200
+    listing = client.get(f"{path}/list").get_json()
+    temporal = STAGE_FILES["temporal_analysis"]
+    assert not set(listing["pending"]) & set(temporal)
+    assert set(temporal) <= set(listing["files"])
+    assert len(listing["pending"]) == len(CHART_FILES) - len(temporal)
+
+
+def test_render_on_demand_renders_a_stage_once(lazy_run):
+    _, _, out_dir, _ = lazy_run
+    first = render_on_demand(out_dir, "timeline_analysis")
+    assert first["error"] is None
+    assert first["outputs"] == ["comment_timeline.png", "engagement_timeline.png"]
+    assert [name for name, _ in first["figures"]] == first["outputs"]
+    with open(os.path.join(out_dir, STAGE_RESULT.format("timeline_analysis")), encoding="utf8") as f:
+        assert json.load(f)["outputs"] == first["outputs"]
+
+    rendered_at = os.path.getmtime(os.path.join(out_dir, "comment_timeline.png"))
+    again = render_on_demand(out_dir, "timeline_analysis")
+    assert again["outputs"] == first["outputs"] and again["figures"] == []
+    assert os.path.getmtime(os.path.join(out_dir, "comment_timeline.png")) == rendered_at
+
+
+def test_render_on_demand_needs_the_run_table(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        render_on_demand(str(tmp_path), "timeline_analysis")
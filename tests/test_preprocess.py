@@ -0,0 +1,30 @@
+import os, re
+import pandas as pd
+import pytest
+from services.text_preprocess import clean_text, clean_texts
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs", "analysis.csv")
+
+
+def baseline_clean(t: str) -> str:
+    # What add_text_features applied per row before the substitutions were fused
+    t = re.sub(r"http\S+", "", t)
+    t = re.sub(r"[@#]\S+", "", t)
+    t = re.sub(r"[^A-Za-z0-9\s]", "", t)
+    return re.sub(r"\s+", " ", t).strip()
+
+
+@pytest.mark.parametrize("column", ["text", "cleaned"])
+def test_cleaned_column_matches_the_per_row_pipeline(column):
+    texts = pd.read_csv(SAMPLE_CSV)[column].fillna("").astype(str)
+    assert clean_texts(texts).tolist() == texts.map(baseline_clean).tolist()
+
+
+@pytest.mark.parametrize("text", [
+    "", "   ", "see https://x.y/a?b=1 now", "@user hi #tag there", "a @ b # c", "email me@host.com",
+    "http://a.b/c@d #x@y", "café naïve — déjà vu", "tabs\tand\nnewlines\r\n", "ＦＵＬＬ width １２３",
+    "emoji 😀👍🏽 and ❤️", "keep 123 and under_score", "trailing @", "#", "@@a ##b",
+])
+def test_clean_text_matches_the_per_row_pipeline(text):
+    assert clean_text(text) == baseline_clean(text)
+    assert clean_texts(pd.Series([text])).tolist() == [baseline_clean(text)]
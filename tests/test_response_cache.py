@@ -0,0 +1,94 @@
+import json, time
+from services.response_cache import ResponseCache
+
+URL = "https://api.test/commentThreads"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", etag=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    """Serves one body per URL and answers If-None-Match with 304 while it is unchanged"""
+
+    def __init__(self):
+        self.bodies, self.requests = {}, []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        body, etag = self.bodies[url]
+        if etag and (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, body, etag)
+
+
+def make_cache(tmp_path, **options):
+    return ResponseCache(str(tmp_path / "api.sqlite"), **{"ttl": 3600, "max_age": 86400, "max_bytes": 10**6, **options})
+
+
+def test_fresh_entries_skip_the_network_and_stale_ones_revalidate(tmp_path):
+    session, cache = FakeSession(), make_cache(tmp_path, ttl=0.2)
+    session.bodies[URL] = (b'{"items": [1]}', '"v1"')
+    params = {"videoId": "abc", "key": "secret"}
+
+    first = cache.get(session, URL, params, timeout=5)
+    assert first.json() == {"items": [1]} and len(session.requests) == 1
+    # The API key is not part of the cache key
+    assert cache.get(session, URL, {**params, "key": "other"}, timeout=5).from_cache
+    assert len(session.requests) == 1
+
+    time.sleep(0.25)
+    revalidated = cache.get(session, URL, params, timeout=5)
+    assert session.requests[-1][1] == {"If-None-Match": '"v1"'}
+    assert revalidated.from_cache and revalidated.json() == {"items": [1]}
+    # A 304 refreshes the entry, so the next read is fresh again
+    cache.get(session, URL, params, timeout=5)
+    assert len(session.requests) == 2
+
+    session.bodies[URL] = (b'{"items": [2]}', '"v2"')
+    changed = cache.get(session, URL, params, timeout=5, revalidate=True)
+    assert changed.status_code == 200 and changed.json() == {"items": [2]}
+    assert cache.get(session, URL, params, timeout=5).json() == {"items": [2]}
+
+
+def test_body_etag_is_used_when_the_header_is_missing(tmp_path):
+    session, cache = FakeSession(), make_cache(tmp_path)
+    session.bodies[URL] = (b'{"etag": "body-tag", "items": []}', None)
+    cache.get(session, URL, {}, timeout=5)
+    session.bodies[URL] = (b'{"etag": "body-tag", "items": []}', "body-tag")
+    assert cache.get(session, URL, {}, timeout=5, revalidate=True).from_cache
+    assert session.requests[-1][1] == {"If-None-Match": "body-tag"}
+
+
+def test_least_recently_used_entries_are_evicted_over_max_bytes(tmp_path):
+    session, cache = FakeSession(), make_cache(tmp_path, max_bytes=250)
+    for name in "abc":
+        session.bodies[f"{URL}/{name}"] = (name.encode() * 100, f'"{name}"')
+    cache.get(session, f"{URL}/a", {}, timeout=5)
+    cache.get(session, f"{URL}/b", {}, timeout=5)
+    time.sleep(0.01)
+    cache.get(session, f"{URL}/a", {}, timeout=5)  # a is now more recently used than b
+    cache.get(session, f"{URL}/c", {}, timeout=5)
+
+    assert cache.stats()["entries"] == 2 and cache.stats()["bytes"] <= 250
+    requests_before = len(session.requests)
+    assert cache.get(session, f"{URL}/a", {}, timeout=5).from_cache
+    assert cache.get(session, f"{URL}/c", {}, timeout=5).from_cache
+    assert len(session.requests) == requests_before
+    assert not getattr(cache.get(session, f"{URL}/b", {}, timeout=5), "from_cache", False)
+
+
+def test_entries_not_refreshed_within_max_age_are_dropped(tmp_path):
+    session, cache = FakeSession(), make_cache(tmp_path, ttl=0, max_age=0.1)
+    session.bodies[f"{URL}/old"] = (b"{}", '"old"')
+    session.bodies[f"{URL}/new"] = (b"{}", '"new"')
+    cache.get(session, f"{URL}/old", {}, timeout=5)
+    time.sleep(0.15)
+    cache.get(session, f"{URL}/new", {}, timeout=5)
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,97 @@
+import os, time
+import numpy as np
+import pandas as pd
+import pytest
+from textblob import TextBlob
+from services import sentiment_service
+from services.lexicon_scorer import get_scorer
+from services.sentiment_cache import SentimentCache
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs", "analysis.csv")
+
+
+def textblob_scores(texts):
+    return np.array([TextBlob(t).sentiment[:2] if t.strip() else (0.0, 0.0) for t in texts]).reshape(-1, 2)
+
+
+@pytest.mark.parametrize("text", [
+    "good", "not good", "very good", "really not good", "not a good movie", "very not good",
+    "good!", "extremely bad!!", "never really nice", "I don't like it, it's terrible",
+    "good :) but (!) bad :(", "very :) good", "xD lol", "", "   ", "no words known here",
+    "i love it :d", "I LOVE it :D", "XD lol"
+])
+def test_lexicon_rules_match_textblob(text):
+    polarity, subjectivity = get_scorer().score([text])
+    expected = textblob_scores([text])[0]
+    assert polarity[0] == pytest.approx(expected[0], abs=1e-12)
+    assert subjectivity[0] == pytest.approx(expected[1], abs=1e-12)
+
+
+@pytest.mark.parametrize("column", ["cleaned", "text"])
+def test_lexicon_parity_on_sample_comments(column):
+    texts = pd.read_csv(SAMPLE_CSV)[column].fillna("").astype(str).tolist()
+    scorer = get_scorer()
+
+    started = time.perf_counter()
+    expected = textblob_scores(texts)
+    textblob_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    polarity, subjectivity = scorer.score(texts)
+    lexicon_seconds = time.perf_counter() - started
+
+    agree = np.isclose(polarity, expected[:, 0], atol=1e-9) & np.isclose(subjectivity, expected[:, 1], atol=1e-9)
+    print(f"\n{column}: {agree.mean():.2%} of {len(texts)} comments agree, "
+          f"textblob {textblob_seconds:.3f}s vs lexicon {lexicon_seconds:.3f}s "
+          f"({textblob_seconds / max(lexicon_seconds, 1e-9):.1f}x)")
+    assert agree.all()
+
+
+@pytest.mark.parametrize("scorer", ["textblob", "lexicon"])
+@pytest.mark.parametrize("texts", [
+    ["i love it :d", "I LOVE it :D"],
+    ["I LOVE it :D", "i love it :d"],
+    ["Great :)", "great :)", "GREAT :)", "great  :)"],
+])
+def test_cache_never_changes_scores(monkeypatch, scorer, texts):
+    monkeypatch.setattr(sentiment_service, "_cache", SentimentCache(1000))
+    expected = textblob_scores(texts)
+    # Cold, within one batch, then with every variant already cached the other way round
+    for batch in (texts, texts, texts[::-1]):
+        polarity, subjectivity, _ = sentiment_service.score_texts(batch, scorer=scorer)
+        reference = expected if batch is texts else expected[::-1]
+        assert polarity == pytest.approx(reference[:, 0], abs=1e-12)
+        assert subjectivity == pytest.approx(reference[:, 1], abs=1e-12)
+
+
+def test_submitted_batch_survives_a_pool_reset(monkeypatch):
+    monkeypatch.setattr(sentiment_service, "SENTIMENT_WORKERS", 2)
+    monkeypatch.setattr(sentiment_service, "_pool", None)
+    monkeypatch.setattr(sentiment_service, "_cache", SentimentCache(1000))
+    texts = [f"comment {i} is {'good' if i % 2 else 'bad'}" for i in range(40)]
+    batch = sentiment_service.submit_texts(texts, chunk_size=1)
+    pool = sentiment_service._pool
+    try:
+        # Another batch's worker died: the reset cancels this batch's queued chunks
+        sentiment_service._reset_pool(pool)
+        polarity, subjectivity, _ = batch.result()
+    finally:
+        pool.shutdown()
+    expected = textblob_scores(texts)
+    assert polarity == pytest.approx(expected[:, 0], abs=1e-12)
+    assert subjectivity == pytest.approx(expected[:, 1], abs=1e-12)
+    assert batch.done()
+
+
+def test_cache_store_keeps_the_newest_scores(tmp_path):
+    path = str(tmp_path / "scores.sqlite")
+    cache = SentimentCache(10, path, max_rows=50)
+    keys = [SentimentCache.make_key(f"text {i}", "test") for i in range(200)]
+    for i in range(0, len(keys), 20):
+        cache.put_many({k: (0.5, 0.5) for k in keys[i:i + 20]})
+    stored = cache.get_many(keys)
+    assert 45 <= len(stored) <= 50
+    assert set(keys[-45:]) <= set(stored)
+
+    # A lower limit applies as soon as the store is opened
+    reopened = SentimentCache(10, path, max_rows=20)
+    assert set(reopened.get_many(keys)) == set(keys[-18:])
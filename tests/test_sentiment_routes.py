@@ -0,0 +1,55 @@
+import json
+import pytest
+from flask import Flask
+import routes.sentiment
+from routes.sentiment import sentiment_bp
+from services import sentiment_service
+from services.sentiment_cache import SentimentCache
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(sentiment_service, "_cache", SentimentCache(1000))
+    app = Flask(__name__)
+    app.register_blueprint(sentiment_bp)
+    return app.test_client()
+
+
+def test_batch_over_the_limit_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(routes.sentiment, "SENTIMENT_BATCH_MAX_TEXTS", 3)
+    ok = client.post("/sentiment/batch", json={"texts": ["good", "bad", "good"]})
+    assert ok.status_code == 200
+    assert [r["sentiment"] for r in ok.get_json()["results"]] == ["Positive", "Negative", "Positive"]
+
+    too_many = client.post("/sentiment/batch", json={"texts": ["good"] * 4})
+    assert too_many.status_code == 413
+    assert "At most 3" in too_many.get_json()["error"]
+    assert client.post("/sentiment/batch", json={"texts": "good"}).status_code == 400
+
+
+@pytest.mark.parametrize("scorer", ["textblob", "lexicon"])
+def test_stream_keeps_input_order_and_reports_bad_lines(client, monkeypatch, scorer):
+    # Small batches so the results of several batches have to be put back in order
+    monkeypatch.setattr(routes.sentiment, "SENTIMENT_STREAM_BATCH", 3)
+    lines = [json.dumps(f"good {i}" if i % 2 else f"bad {i}") for i in range(10)]
+    lines[4] = "{not json"
+    lines[7] = json.dumps({"text": "terrible", "id": "x7"})
+    lines[8] = json.dumps({"id": 8})
+    body = "\n".join(lines[:6] + [""] + lines[6:]) + "\n"
+
+    r = client.post(f"/sentiment/stream?scorer={scorer}", data=body, content_type="application/x-ndjson")
+    assert r.status_code == 200 and r.mimetype == "application/x-ndjson"
+    results = [json.loads(line) for line in r.get_data(as_text=True).splitlines()]
+
+    # The blank 7th line is skipped but still counted
+    assert [item["line"] for item in results] == [1, 2, 3, 4, 5, 6, 8, 9, 10, 11]
+    assert "error" in results[4] and "sentiment" not in results[4]
+    assert "error" in results[8]
+    assert results[7] == {"line": 9, "id": "x7", "sentiment": "Negative", "polarity": -1.0, "subjectivity": 1.0}
+    assert [item["sentiment"] for i, item in enumerate(results) if i in (0, 1, 2, 3, 5, 6, 9)] == \
+        ["Negative", "Positive", "Negative", "Positive", "Positive", "Negative", "Positive"]
+
+
+def test_stream_rejects_an_unknown_scorer(client):
+    r = client.post("/sentiment/stream?scorer=nope", data=json.dumps("good") + "\n")
+    assert r.status_code == 400